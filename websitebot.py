@@ -1,3 +1,4 @@
+import asyncio
 import pandas as pd
 import numpy as np
 import os
@@ -42,16 +43,28 @@ current_recommendations = {}
 daily_analysis = {}
 last_update_time = None
 
+# Memo for is_market_hours(): the answer only changes at the open/close
+# boundary, so cache it briefly instead of re-running the tz conversion
+# and strftime on every page render
+_market_hours_cache = {'ts': 0.0, 'val': False}
+
 def is_market_hours():
-    """Check if it's currently market hours in IST"""
+    """Check if it's currently market hours in IST (cached for 30s)"""
+    now_ts = time.time()
+    if now_ts - _market_hours_cache['ts'] < 30:
+        return _market_hours_cache['val']
+
     now = datetime.datetime.now(IST_TIMEZONE)
     current_time = now.strftime("%H:%M")
     current_day = now.weekday()
-    
+
     # Check if it's a weekday (0-4 is Monday to Friday)
+    result = False
     if current_day < 5:
-        return MARKET_OPEN_TIME <= current_time <= MARKET_CLOSE_TIME
-    return False
+        result = MARKET_OPEN_TIME <= current_time <= MARKET_CLOSE_TIME
+    _market_hours_cache['ts'] = now_ts
+    _market_hours_cache['val'] = result
+    return result
 
 def load_stock_data():
     """Load stocks data from CSV file"""
@@ -320,7 +333,8 @@ def create_technical_chart(df, symbol):
         fig.add_trace(go.Scatter(x=df['date'], y=df['BB_Lower'], name='BB Lower', line=dict(color='rgba(173, 204, 255, 0.7)')), row=1, col=1)
         
         # Add volume bar chart
-        colors = ['green' if row['close'] >= row['open'] else 'red' for _, row in df.iterrows()]
+        # Column zip instead of iterrows(): no per-row Series boxing
+        colors = ['green' if c >= o else 'red' for c, o in zip(df['close'], df['open'])]
         fig.add_trace(go.Bar(x=df['date'], y=df['volume'], name='Volume', marker_color=colors), row=2, col=1)
         
         # Add RSI
@@ -384,6 +398,32 @@ async def send_telegram_photo(photo_path, caption, target=None):
     except Exception as e:
         print(f"Error sending Telegram photo: {e}")
 
+async def analyze_symbols_concurrently(symbols, max_concurrency=10):
+    """Fetch and analyze many symbols concurrently.
+
+    The per-symbol work is independent and dominated by the data fetch, so
+    it is dispatched to worker threads and gathered on the event loop with
+    a bounded semaphore. Returns a list of (symbol, stock_data,
+    recommendations) tuples; failed symbols are omitted."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def analyze_one(symbol):
+        try:
+            async with semaphore:
+                stock_data = await asyncio.to_thread(fetch_latest_data, symbol)
+            if stock_data.empty:
+                print(f"Skipping {symbol} due to data fetching error")
+                return None
+            stock_data = await asyncio.to_thread(calculate_indicators, stock_data)
+            recommendations = get_recommendations_with_targets(stock_data, symbol)
+            return (symbol, stock_data, recommendations)
+        except Exception as e:
+            print(f"Error analyzing {symbol}: {e}")
+            return None
+
+    results = await asyncio.gather(*(analyze_one(s) for s in symbols))
+    return [r for r in results if r is not None]
+
 def format_recommendations_message(recommendations):
     """Format recommendations for Telegram message"""
     msg = f"*Stock Recommendations ({recommendations['timestamp']})*\n\n"
@@ -417,24 +457,13 @@ async def run_analysis():
     
     print(f"Running analysis at {datetime.datetime.now(IST_TIMEZONE).strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Process each stock
-    for _, row in stocks_df.iterrows():
-        symbol = row['symbol']
-        
-        # Fetch latest data
-        stock_data = fetch_latest_data(symbol)
-        
-        if stock_data.empty:
-            print(f"Skipping {symbol} due to data fetching error")
-            continue
-        
-        # Calculate technical indicators
-        stock_data = calculate_indicators(stock_data)
-        
-        # Generate recommendations with targets
-        recommendations = get_recommendations_with_targets(stock_data, symbol)
+    # Fetch and analyze all stocks concurrently; notifications stay serial
+    # below to respect Telegram rate limits
+    analyzed = await analyze_symbols_concurrently(stocks_df['symbol'].tolist())
+
+    for symbol, stock_data, recommendations in analyzed:
         all_recommendations.append(recommendations)
-        
+
         # If it's a significant recommendation (BUY or SELL), send individual notification
         if recommendations.get('recommendations', {}).get('OVERALL') in ['BUY', 'SELL']:
             message = format_recommendations_message(recommendations)
@@ -468,17 +497,10 @@ async def generate_daily_analysis():
     sell_recommendations = []
     hold_recommendations = []
     
-    # Run analysis for all stocks
-    for _, row in stocks_df.iterrows():
-        symbol = row['symbol']
-        stock_data = fetch_latest_data(symbol)
-        
-        if stock_data.empty:
-            continue
-            
-        stock_data = calculate_indicators(stock_data)
-        recommendations = get_recommendations_with_targets(stock_data, symbol)
-        
+    # Run analysis for all stocks concurrently
+    analyzed = await analyze_symbols_concurrently(stocks_df['symbol'].tolist())
+
+    for symbol, stock_data, recommendations in analyzed:
         overall_rec = recommendations.get('recommendations', {}).get('OVERALL')
         if overall_rec == 'BUY':
             buy_recommendations.append({
@@ -705,8 +727,7 @@ def generate_timeframe_analysis(timeframe):
     categorized_stocks = {category: [] for category in rsi_categories}
     
     # Process each stock
-    for _, row in stocks_df.iterrows():
-        symbol = row['symbol']
+    for symbol in stocks_df['symbol']:
         
         # Fetch data for the specified timeframe
         stock_data = fetch_timeframe_data(symbol, timeframe)
@@ -1169,8 +1190,7 @@ def monthly_analysis():
     categorized_stocks = {category: [] for category in rsi_categories}
     
     # Process each stock
-    for _, row in stocks_df.iterrows():
-        symbol = row['symbol']
+    for symbol in stocks_df['symbol']:
         
         # Fetch data for the specified timeframe
         stock_data = fetch_timeframe_data(symbol, timeframe)